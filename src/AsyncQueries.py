@@ -0,0 +1,54 @@
+import asyncio
+import copy
+import functools
+
+
+class AsyncQueries:
+    """This class runs the queries of an algorithms object on an executor for asyncio code, so a long query does not
+    block the event loop. Identical queries (same method, arguments and graph mc) that are in flight at the same time
+    share one computation."""
+
+    def __init__(self, algo, executor=None):
+        self.algo = algo
+        self.executor = executor
+        self.in_flight = {}
+
+    async def call(self, name: str, arguments: tuple, timeout: float = None):
+        """
+        runs a method of the algorithms object on the executor, or waits for the identical call that is running.
+        a caller that is cancelled or times out stops waiting, and the computation is cancelled once nobody waits
+        for it (a computation that already started in a thread runs to its end, but its result is dropped)
+        :param name: name of the method to call
+        :param arguments: arguments tuple of the method, must be hashable
+        :param timeout: seconds to wait for the result, None waits until it is ready
+        :return: the result of the method, callers that joined a running call get their own copy of it
+        """
+        graph = self.algo.get_graph()
+        key = (name, arguments, id(graph), -1 if graph is None else graph.get_mc())
+        entry = self.in_flight.get(key)
+        joined = entry is not None
+        if not joined:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, functools.partial(getattr(self.algo, name), *arguments))
+            entry = [future, 0]
+            self.in_flight[key] = entry
+            future.add_done_callback(lambda done: self.forget(key, entry))
+        entry[1] += 1
+        try:
+            result = await asyncio.wait_for(asyncio.shield(entry[0]), timeout)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not entry[0].done():
+                entry[0].cancel()
+                self.forget(key, entry)
+        return copy.deepcopy(result) if joined else result
+
+    def forget(self, key: tuple, entry: list) -> None:
+        """
+        removes a call from the calls in flight, so the next identical call runs again
+        :param key: the key of the call
+        :param entry: [future, number of waiting callers] of the call
+        :return: None
+        """
+        if self.in_flight.get(key) is entry:
+            del self.in_flight[key]
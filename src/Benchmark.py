@@ -0,0 +1,209 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+DATA_FILES = ["A0", "A1", "A2", "A3", "A4", "A5"]
+SYNTHETIC_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+
+
+def synthetic_graph(size: int, degree: int = 3, seed: int = 0) -> DiGraph:
+    """
+    a random graph with positions in the unit square, every node has degree out edges to random nodes
+    :param size: number of nodes
+    :param degree: number of out edges of every node
+    :param seed: seed of the random numbers, the same seed gives the same graph
+    :return: the graph
+    """
+    generator = np.random.default_rng(seed)
+    graph = DiGraph()
+    positions = np.column_stack([generator.random((size, 2)), np.zeros(size)])
+    graph.add_nodes_from(range(size), positions.tolist())
+    sources = np.repeat(np.arange(size), degree)
+    destinations = generator.integers(0, size, len(sources))
+    keep = sources != destinations
+    graph.add_edges_from(sources[keep], destinations[keep], generator.uniform(1, 2, int(keep.sum())))
+    return graph
+
+
+def timed(function, *arguments):
+    """
+    :param function: the function to time
+    :return: (seconds the call took, result of the call)
+    """
+    start = time.perf_counter()
+    result = function(*arguments)
+    return time.perf_counter() - start, result
+
+
+def peak_memory(function, *arguments) -> int:
+    """
+    :param function: the function to measure
+    :return: the peak of the memory allocated by python during the call, in bytes
+    """
+    tracemalloc.start()
+    try:
+        function(*arguments)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def single(seconds: float, items: int, peak: int = None) -> dict:
+    """
+    :param seconds: time of one call
+    :param items: number of items (nodes and edges, queries...) the call handled
+    :param peak: peak memory of the call in bytes
+    :return: result record of an operation that was timed once
+    """
+    record = {"seconds": seconds, "per_second": items / seconds if seconds > 0 else None}
+    if peak is not None:
+        record["peak_bytes"] = peak
+    return record
+
+
+def latencies(function, calls: list, peak: int = None) -> dict:
+    """
+    times every call separately
+    :param function: the function to time
+    :param calls: list of arguments tuples
+    :param peak: peak memory of the calls in bytes
+    :return: result record with the total time, the calls per second and the latency percentiles in milliseconds
+    """
+    times = np.array([timed(function, *arguments)[0] for arguments in calls])
+    record = single(float(times.sum()), len(calls), peak)
+    record["calls"] = len(calls)
+    if len(calls) > 0:
+        record["latency_ms"] = {name: float(np.percentile(times, percentile) * 1000)
+                                for name, percentile in [("p50", 50), ("p90", 90), ("p99", 99), ("max", 100)]}
+    return record
+
+
+def bench_graph(graph: DiGraph, file_name: str, queries: int, seed: int, memory: bool) -> dict:
+    """
+    measures the operations on one graph
+    :param graph: the graph, None to load it from file_name
+    :param file_name: json file of the graph, ignored for a given graph (it is written to a temporary file)
+    :param queries: number of shortest path, component and mutation calls
+    :param seed: seed of the random queries
+    :param memory: measure the peak memory of every operation (in a separate run, so the times are not affected)
+    :return: dictionary of the result record of every operation
+    """
+    results = {}
+    algo = GraphAlgo(graph)
+    with tempfile.TemporaryDirectory() as directory:
+        saved_name = os.path.join(directory, "saved.json")
+        if graph is not None:
+            file_name = os.path.join(directory, "graph.json")
+            seconds = timed(algo.save_to_json, file_name)[0]
+            results["save_to_json"] = single(seconds, graph.v_size() + graph.e_size(),
+                                             peak_memory(algo.save_to_json, saved_name) if memory else None)
+        seconds, loaded = timed(algo.load_from_json, file_name)
+        if not loaded:
+            raise IOError("can not load " + file_name)
+        graph = algo.get_graph()
+        items = graph.v_size() + graph.e_size()
+        results["load_from_json"] = single(seconds, items,
+                                           peak_memory(GraphAlgo().load_from_json, file_name) if memory else None)
+        if "save_to_json" not in results:
+            seconds = timed(algo.save_to_json, saved_name)[0]
+            results["save_to_json"] = single(seconds, items,
+                                             peak_memory(algo.save_to_json, saved_name) if memory else None)
+    results["nodes"], results["edges"] = graph.v_size(), graph.e_size()
+    rand = random.Random(seed)
+    keys = list(graph.get_all_v())
+    pairs = [(rand.choice(keys), rand.choice(keys)) for number in range(queries)]
+    results["shortest_path"] = latencies(algo.shortest_path, pairs,
+                                         peak_memory(algo.shortest_path, *pairs[0]) if memory and pairs else None)
+    seconds = timed(GraphAlgo(graph).connected_components)[0]
+    results["connected_components"] = single(seconds, items,
+                                             peak_memory(GraphAlgo(graph).connected_components) if memory else None)
+    results["connected_component"] = latencies(algo.connected_component, [(id1,) for id1, id2 in pairs])
+    results["add_edge"] = latencies(graph.add_edge, [(id1, id2, 1.0) for id1, id2 in pairs])
+    results["remove_edge"] = latencies(graph.remove_edge, pairs)
+    results["remove_node"] = latencies(graph.remove_node, [(id1,) for id1, id2 in pairs])
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_seconds: float = 0.001) -> list:
+    """
+    :param results: results of this run
+    :param baseline: results of an earlier run
+    :param threshold: allowed slowdown, 0.2 allows 20%
+    :param min_seconds: operations that took less than this in the baseline are too noisy to compare
+    :return: list of the operations that got slower than the threshold, as readable lines
+    """
+    regressions = []
+    for name, operations in results["graphs"].items():
+        for operation, record in operations.items():
+            before = baseline.get("graphs", {}).get(name, {}).get(operation)
+            if not isinstance(record, dict) or not isinstance(before, dict) or before["seconds"] < min_seconds:
+                continue
+            ratio = record["seconds"] / before["seconds"]
+            if ratio > 1 + threshold:
+                regressions.append(f"{name} {operation}: {before['seconds']:.4f}s -> {record['seconds']:.4f}s "
+                                   f"({ratio:.2f}x)")
+    return regressions
+
+
+def commit() -> str:
+    """
+    :return: the git commit of the source tree, None outside of a git repository
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(arguments=None) -> int:
+    parser = argparse.ArgumentParser(description="times the graph operations on the data files and on random graphs")
+    parser.add_argument("--data", nargs="*", default=DATA_FILES, help="names of json files in the data directory")
+    parser.add_argument("--sizes", nargs="*", type=int, default=SYNTHETIC_SIZES, help="nodes of the random graphs")
+    parser.add_argument("--degree", type=int, default=3, help="out edges of every node of the random graphs")
+    parser.add_argument("--queries", type=int, default=200, help="calls of every query and mutation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory runs")
+    parser.add_argument("--output", help="json file for the results (default: standard output)")
+    parser.add_argument("--baseline", help="json results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown against the baseline")
+    parser.add_argument("--min-seconds", type=float, default=0.001,
+                        help="operations faster than this in the baseline are not compared")
+    options = parser.parse_args(arguments)
+    results = {"commit": commit(), "python": sys.version.split()[0], "platform": platform.platform(),
+               "queries": options.queries, "seed": options.seed, "graphs": {}}
+    for name in options.data:
+        results["graphs"][name] = bench_graph(None, os.path.join(DATA_DIR, name), options.queries, options.seed,
+                                              not options.no_memory)
+    for size in options.sizes:
+        graph = synthetic_graph(size, options.degree, options.seed)
+        results["graphs"][f"random_{size}"] = bench_graph(graph, None, options.queries, options.seed,
+                                                          not options.no_memory)
+    text = json.dumps(results, indent=4)
+    if options.output:
+        with open(options.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    if options.baseline:
+        with open(options.baseline) as file:
+            regressions = compare(results, json.load(file), options.threshold, options.min_seconds)
+        for line in regressions:
+            print("slower: " + line, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
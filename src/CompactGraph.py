@@ -0,0 +1,349 @@
+import heapq
+import Instrumentation
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from GraphInterface import GraphInterface
+
+
+BINARY_MAGIC = b"EX3GRAPH"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<8sqqqq24x")
+
+
+class CompactGraph(GraphInterface):
+    """This class represents an immutable directed weighted graph stored in compressed sparse row (CSR) form.
+    Every node gets an index in [0, v_size()), and the out edges of the node at index i are
+    neighbors[offsets[i]:offsets[i + 1]] with the matching weights[offsets[i]:offsets[i + 1]]."""
+
+    def __init__(self, keys: array, offsets: array, neighbors: array, weights: array, positions: array = None,
+                 mc: int = 0, index_of: dict = None):
+        self.keys = keys
+        self.index_of = index_of if index_of is not None else {key: index for index, key in enumerate(keys)}
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.weights = weights
+        self.positions = positions if positions is not None else array('d', [math.nan]) * (3 * len(keys))
+        self.mc = mc
+        self.reverse = None
+
+    @classmethod
+    def from_graph(cls, graph: GraphInterface) -> "CompactGraph":
+        """
+        builds a CSR snapshot of a graph
+        :param graph: the graph to snapshot
+        :return: CompactGraph with the nodes, edges, positions and mc of the graph
+        """
+        nodes = graph.get_all_v()
+        keys = array('q', nodes.keys())
+        index_of = {key: index for index, key in enumerate(keys)}
+        offsets = array('q', [0])
+        neighbors = array('q')
+        weights = array('d')
+        positions = array('d')
+        for key in keys:
+            out_edges = graph.all_out_edges_of_node(key)
+            neighbors.extend([index_of[dst] for dst in out_edges])
+            weights.extend(out_edges.values())
+            offsets.append(len(neighbors))
+            pos = graph.get_pos(key)
+            positions.extend(pos if pos is not None else (math.nan, math.nan, math.nan))
+        return cls(keys, offsets, neighbors, weights, positions, graph.get_mc())
+
+    def save_binary(self, file_name: str) -> None:
+        """
+        writes the graph in the binary format: a 64 bytes header (magic, version, v_size, e_size, mc) followed by
+        the keys, positions, offsets, neighbors and weights arrays as little endian 8 bytes values.
+        the file is written aside and then renamed, so graphs that memory map the old file keep working
+        :param file_name: The path to the out file
+        :return: None
+        """
+        if not file_name:
+            raise FileNotFoundError("empty file name")
+        temp_name = file_name + ".tmp"
+        try:
+            with open(temp_name, "wb") as file:
+                file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, self.v_size(), self.e_size(), self.mc))
+                for values, typecode in [(self.keys, 'q'), (self.positions, 'd'), (self.offsets, 'q'),
+                                         (self.neighbors, 'q'), (self.weights, 'd')]:
+                    values = array(typecode, values)
+                    if sys.byteorder != "little":
+                        values.byteswap()
+                    values.tofile(file)
+            os.replace(temp_name, file_name)
+        finally:
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+
+    @classmethod
+    def load_binary(cls, file_name: str, use_mmap: bool = True) -> "CompactGraph":
+        """
+        reads a graph written by save_binary.
+        with use_mmap the arrays are read only views of the memory mapped file, so nothing is copied and processes
+        that load the same file share its pages
+        :param file_name: The path to the file
+        :param use_mmap: map the file instead of reading it
+        :return: the loaded CompactGraph
+        """
+        with open(file_name, "rb") as file:
+            if use_mmap:
+                data = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                data = memoryview(file.read())
+        if len(data) < BINARY_HEADER.size:
+            raise ValueError("not a binary graph file: " + file_name)
+        magic, version, v_size, e_size, mc = BINARY_HEADER.unpack_from(data)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError("not a binary graph file: " + file_name)
+        sections = []
+        start = BINARY_HEADER.size
+        for length, typecode in [(v_size, 'q'), (3 * v_size, 'd'), (v_size + 1, 'q'), (e_size, 'q'), (e_size, 'd')]:
+            section = data[start:start + 8 * length]
+            if len(section) != 8 * length:
+                raise ValueError("truncated binary graph file: " + file_name)
+            if sys.byteorder != "little":
+                section = array(typecode, section.tobytes())
+                section.byteswap()
+            else:
+                section = section.cast(typecode)
+            sections.append(section)
+            start += 8 * length
+        keys, positions, offsets, neighbors, weights = sections
+        return cls(keys, offsets, neighbors, weights, positions, mc)
+
+    def v_size(self) -> int:
+        """
+        Returns the number of vertices in this graph
+        @return: The number of vertices in this graph
+        """
+        return len(self.keys)
+
+    def e_size(self) -> int:
+        """
+        Returns the number of edges in this graph
+        @return: The number of edges in this graph
+        """
+        return len(self.neighbors)
+
+    def get_all_v(self) -> dict:
+        """return a dictionary of all the nodes in the Graph, each node is represented using a pair (key, index)
+        """
+        return self.index_of
+
+    def get_mc(self) -> int:
+        """
+        Returns the mc of the graph this snapshot was taken from
+        @return: The version of this graph.
+        """
+        return self.mc
+
+    def get_pos(self, id1: int) -> tuple:
+        """
+        :param id1: node id
+        :return: the (x, y, z) position of the node, None if it has no position
+        """
+        start = 3 * self.index_of.get(id1)
+        if math.isnan(self.positions[start]):
+            return None
+        return tuple(self.positions[start:start + 3])
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        """return a dictionary of all the nodes connected to (into) node_id ,
+        each node is represented using a pair (key, weight)
+         """
+        in_offsets, in_neighbors, in_weights = self.reverse_arrays()
+        index = self.index_of.get(id1)
+        start, end = in_offsets[index], in_offsets[index + 1]
+        return dict(zip(map(self.keys.__getitem__, in_neighbors[start:end]), in_weights[start:end]))
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        """return a dictionary of all the nodes connected from node_id , each node is represented using a pair (key,
+        weight)
+        """
+        index = self.index_of.get(id1)
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return dict(zip(map(self.keys.__getitem__, self.neighbors[start:end]), self.weights[start:end]))
+
+    def dijkstra(self, source: int, reverse: bool = False, target: int = -1):
+        """
+        dijkstra's algorithm directly on the CSR arrays, with node indexes instead of ids
+        :param source: index of the node to start the traversal from
+        :param reverse: follow the edges backwards (distances to the source instead of from it)
+        :param target: index of a node to stop at once it is settled (the distances of the nodes that are not
+        settled yet are then upper bounds)
+        :return: list of the distance of every index (inf if it is not reached),
+        list of the predecessor of every index (-1 if there is none), list of the reached indexes in settle order
+        """
+        offsets, neighbors, weights = self.reverse_arrays() if reverse else (self.offsets, self.neighbors, self.weights)
+        push, pop = heapq.heappush, heapq.heappop
+        stats = Instrumentation.start("compact_dijkstra") if Instrumentation.hooks else None
+        if stats is not None:
+            push, pop = stats.counted(push, "heap_pushes"), stats.counted(pop, "heap_pops")
+        size = len(self.keys)
+        distances = [math.inf] * size
+        predecessors = [-1] * size
+        settled = bytearray(size)
+        order = []
+        distances[source] = 0.0
+        nodes_heap = [(0.0, source)]
+        while nodes_heap:
+            current_distance, current = pop(nodes_heap)
+            if settled[current]:
+                continue
+            settled[current] = 1
+            order.append(current)
+            if current == target:
+                break
+            for edge in range(offsets[current], offsets[current + 1]):
+                neighbor = neighbors[edge]
+                distance = current_distance + weights[edge]
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    predecessors[neighbor] = current
+                    push(nodes_heap, (distance, neighbor))
+        if stats is not None:
+            stats.counters["nodes_settled"] += len(order)
+            stats.counters["edges_relaxed"] += sum(offsets[index + 1] - offsets[index] for index in order
+                                                   if index != target)
+            stats.finish()
+        return distances, predecessors, order
+
+    def tarjan(self) -> list:
+        """
+        iterative Tarjan's algorithm directly on the CSR arrays (see ComponentsIndex.tarjan), the roots are taken in
+        index order and the edges of a node in CSR order
+        :return: list of the SCC number of every index, an edge between two SCCs always goes to a smaller number
+        """
+        offsets, neighbors = self.offsets, self.neighbors
+        size = len(self.keys)
+        order = [-1] * size
+        low = [0] * size
+        component_of = [-1] * size
+        stack = []
+        visited = components = 0
+        for root in range(size):
+            if order[root] >= 0:
+                continue
+            order[root] = low[root] = visited
+            visited += 1
+            stack.append(root)
+            work, next_edge = [root], [offsets[root]]
+            while work:
+                node = work[-1]
+                edge, end = next_edge[-1], offsets[node + 1]
+                while edge < end:
+                    neighbor = neighbors[edge]
+                    edge += 1
+                    if order[neighbor] < 0:
+                        break
+                    if component_of[neighbor] < 0 and order[neighbor] < low[node]:
+                        low[node] = order[neighbor]
+                else:
+                    work.pop()
+                    next_edge.pop()
+                    if work and low[node] < low[work[-1]]:
+                        low[work[-1]] = low[node]
+                    if low[node] == order[node]:
+                        member = -1
+                        while member != node:
+                            member = stack.pop()
+                            component_of[member] = components
+                        components += 1
+                    continue
+                next_edge[-1] = edge
+                order[neighbor] = low[neighbor] = visited
+                visited += 1
+                stack.append(neighbor)
+                work.append(neighbor)
+                next_edge.append(offsets[neighbor])
+        return component_of
+
+    def reverse_arrays(self) -> tuple:
+        """
+        builds (once) the CSR arrays of the transposed graph
+        :return: (in_offsets, in_neighbors, in_weights)
+        """
+        if self.reverse is None:
+            size = len(self.keys)
+            in_offsets = array('q', [0]) * (size + 1)
+            for dst in self.neighbors:
+                in_offsets[dst + 1] += 1
+            for index in range(size):
+                in_offsets[index + 1] += in_offsets[index]
+            fill = in_offsets[:-1]
+            in_neighbors = array('q', [0]) * len(self.neighbors)
+            in_weights = array('d', [0]) * len(self.weights)
+            for src in range(size):
+                for edge in range(self.offsets[src], self.offsets[src + 1]):
+                    dst = self.neighbors[edge]
+                    in_neighbors[fill[dst]] = src
+                    in_weights[fill[dst]] = self.weights[edge]
+                    fill[dst] += 1
+            self.reverse = (in_offsets, in_neighbors, in_weights)
+        return self.reverse
+
+    def transpose(self) -> "CompactGraph":
+        """
+        the transposed graph, it shares the keys, positions and index of this graph, and its CSR arrays are the
+        reverse arrays of this graph (built once) while its reverse arrays are the arrays of this graph
+        :return: CompactGraph with every edge reversed
+        """
+        in_offsets, in_neighbors, in_weights = self.reverse_arrays()
+        transposed = CompactGraph(self.keys, in_offsets, in_neighbors, in_weights, self.positions, self.mc,
+                                  self.index_of)
+        transposed.reverse = (self.offsets, self.neighbors, self.weights)
+        return transposed
+
+    def has_edge(self, node_id1: int, node_id2: int) -> bool:
+        if node_id1 not in self.index_of or node_id2 not in self.index_of:
+            return False
+        index = self.index_of.get(node_id1)
+        return self.index_of.get(node_id2) in self.neighbors[self.offsets[index]:self.offsets[index + 1]]
+
+    def add_edge(self, id1: int, id2: int, weight: float) -> bool:
+        """
+        The snapshot is immutable, the function will do nothing
+        @return: False
+        """
+        return False
+
+    def add_node(self, node_id: int, pos: tuple = None) -> bool:
+        """
+        The snapshot is immutable, the function will do nothing
+        @return: False
+        """
+        return False
+
+    def remove_node(self, node_id: int) -> bool:
+        """
+        The snapshot is immutable, the function will do nothing
+        @return: False
+        """
+        return False
+
+    def remove_edge(self, node_id1: int, node_id2: int) -> bool:
+        """
+        The snapshot is immutable, the function will do nothing
+        @return: False
+        """
+        return False
+
+    def as_dict(self):
+        list_of_nodes = []
+        list_of_edges = []
+        for index, key in enumerate(self.keys):
+            pos = self.get_pos(key)
+            encoded_pos = None if pos is None else str(pos[0]) + "," + str(pos[1]) + "," + str(pos[2])
+            list_of_nodes.append({"pos": encoded_pos, "id": key})
+            for edge in range(self.offsets[index], self.offsets[index + 1]):
+                encoded_edge = {"src": key, "w": self.weights[edge], "dest": self.keys[self.neighbors[edge]]}
+                list_of_edges.append(encoded_edge)
+
+        ans = {"Edges": list_of_edges, "Nodes": list_of_nodes}
+        return ans
+
+    def __repr__(self):
+        return "CompactGraph: |V|=" + str(self.v_size()) + " , |E|=" + str(self.e_size())
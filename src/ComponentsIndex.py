@@ -0,0 +1,258 @@
+from GraphInterface import GraphInterface
+from CompactGraph import CompactGraph
+
+MAX_ORDER_DEPTH = 8
+
+
+class ComponentsIndex:
+    """This class represents the Strongly Connected Components(SCC) of a graph at a given mc.
+    Besides the SCC of every node it keeps a topological order of the SCCs (an edge always goes from a smaller
+    order to a bigger one), which lets it follow edge insertions and removals without a full recomputation.
+    The orders are tuples, so an SCC that splits can order its parts below its own order. Once a split makes an
+    order longer than MAX_ORDER_DEPTH all the orders are renumbered to single ints, so comparing them stays cheap
+    however many edits are made."""
+
+    def __init__(self, graph: GraphInterface):
+        self.graph = graph
+        self.mc = graph.get_mc()
+        self.component_of = {}
+        self.components = {}
+        self.order = {}
+        if isinstance(graph, CompactGraph):
+            self.label_compact(graph)
+            return
+        tarjan_of = self.tarjan(graph.get_all_v(), graph.all_out_edges_of_node)
+        count = len(set(tarjan_of.values()))
+        in_edges_of = graph.all_in_edges_of_node
+        for id in graph.get_all_v():
+            if id in self.component_of:
+                continue
+            component, label = tarjan_of[id], len(self.components)
+            specific = [id]
+            self.component_of[id] = label
+            for node_id in specific:
+                for neighbor_id in in_edges_of(node_id):
+                    if neighbor_id not in self.component_of and tarjan_of[neighbor_id] == component:
+                        self.component_of[neighbor_id] = label
+                        specific.append(neighbor_id)
+            self.components[label] = specific
+            self.order[label] = (count - 1 - component,)
+        self.next_label = len(self.components)
+        self.next_order = count
+
+    def label_compact(self, graph: CompactGraph) -> None:
+        """
+        fills the index of a CompactGraph from its CSR arrays (see CompactGraph.tarjan) in the same order as for
+        other graphs, without building the edge dictionaries of its nodes
+        :param graph: the CompactGraph
+        :return: None
+        """
+        tarjan_of = graph.tarjan()
+        count = max(tarjan_of) + 1 if tarjan_of else 0
+        in_offsets, in_neighbors = graph.reverse_arrays()[:2]
+        keys = graph.keys
+        label_of = [-1] * len(keys)
+        for index in range(len(keys)):
+            if label_of[index] >= 0:
+                continue
+            component, label = tarjan_of[index], len(self.components)
+            specific = [index]
+            label_of[index] = label
+            for node in specific:
+                for neighbor in in_neighbors[in_offsets[node]:in_offsets[node + 1]]:
+                    if label_of[neighbor] < 0 and tarjan_of[neighbor] == component:
+                        label_of[neighbor] = label
+                        specific.append(neighbor)
+            self.components[label] = [keys[node] for node in specific]
+            self.order[label] = (count - 1 - component,)
+        self.component_of = dict(zip(keys, label_of))
+        self.next_label = len(self.components)
+        self.next_order = count
+
+    @staticmethod
+    def tarjan(nodes, out_edges_of, members: set = None) -> dict:
+        """
+        iterative Tarjan's algorithm, every node is visited once and every edge is checked once
+        :param nodes: ids of the nodes to start the traversal from
+        :param out_edges_of: function that returns the out edges dictionary of a node
+        :param members: if given, edges to nodes outside of this set are ignored
+        :return: dictionary of the SCC number of every node, an edge between two SCCs always goes to a smaller number
+        """
+        order, low, component_of = {}, {}, {}
+        stack = []
+        components = 0
+        for root in nodes:
+            if root in order:
+                continue
+            order[root] = low[root] = len(order)
+            stack.append(root)
+            work = [(root, iter(out_edges_of(root)))]
+            while work:
+                node_id, neighbors = work[-1]
+                for neighbor_id in neighbors:
+                    if members is not None and neighbor_id not in members:
+                        continue
+                    if neighbor_id not in order:
+                        order[neighbor_id] = low[neighbor_id] = len(order)
+                        stack.append(neighbor_id)
+                        work.append((neighbor_id, iter(out_edges_of(neighbor_id))))
+                        break
+                    if neighbor_id not in component_of and order[neighbor_id] < low[node_id]:
+                        low[node_id] = order[neighbor_id]
+                else:
+                    work.pop()
+                    if work and low[node_id] < low[work[-1][0]]:
+                        low[work[-1][0]] = low[node_id]
+                    if low[node_id] == order[node_id]:
+                        member = None
+                        while member != node_id:
+                            member = stack.pop()
+                            component_of[member] = components
+                        components += 1
+
+        return component_of
+
+    def add_node(self, node_id: int) -> None:
+        """
+        a new node is an SCC of its own
+        :param node_id: id of the node that was added to the graph
+        :return: None
+        """
+        label = self.new_label()
+        self.component_of[node_id] = label
+        self.components[label] = [node_id]
+        self.order[label] = (self.next_order,)
+        self.next_order += 1
+
+    def add_edge(self, id1: int, id2: int) -> None:
+        """
+        updates the SCCs after the edge id1->id2 was added to the graph.
+        if the edge agrees with the topological order nothing changes, otherwise only the SCCs ordered between
+        the two ends are searched (Pearce-Kelly), the SCCs on a new cycle are merged and the others are reordered
+        :param id1: the start node of the edge
+        :param id2: the end node of the edge
+        :return: None
+        """
+        source, destination = self.component_of[id1], self.component_of[id2]
+        if source == destination or self.order[source] < self.order[destination]:
+            return
+        lower, upper = self.order[destination], self.order[source]
+        forward = self.reach(destination, self.graph.all_out_edges_of_node, lambda order: order <= upper)
+        backward = self.reach(source, self.graph.all_in_edges_of_node, lambda order: order >= lower)
+        merged = forward & backward
+        pool = sorted(self.order[component] for component in forward | backward)
+        backward_rest = sorted(backward - merged, key=self.order.get)
+        forward_rest = sorted(forward - merged, key=self.order.get)
+        for position, component in enumerate(backward_rest):
+            self.order[component] = pool[position]
+        for position, component in enumerate(forward_rest):
+            self.order[component] = pool[len(pool) - len(forward_rest) + position]
+        if merged:
+            survivor = max(merged, key=lambda component: len(self.components[component]))
+            for component in merged:
+                if component != survivor:
+                    for node_id in self.components[component]:
+                        self.component_of[node_id] = survivor
+                    self.components[survivor].extend(self.components.pop(component))
+                    self.order.pop(component)
+            self.order[survivor] = pool[len(backward_rest)]
+
+    def remove_edge(self, id1: int, id2: int) -> None:
+        """
+        updates the SCCs after the edge id1->id2 was removed from the graph.
+        only an SCC that contained both ends can change, and only its nodes are searched again
+        :param id1: the start node of the edge
+        :param id2: the end node of the edge
+        :return: None
+        """
+        component = self.component_of[id1]
+        if component == self.component_of[id2]:
+            self.split(component)
+
+    def remove_node(self, node_id: int) -> None:
+        """
+        updates the SCCs after a node (and its edges) was removed from the graph.
+        only the SCC of the node can change, and only its nodes are searched again
+        :param node_id: id of the removed node
+        :return: None
+        """
+        self.remove_nodes([node_id])
+
+    def remove_nodes(self, node_ids) -> None:
+        """
+        updates the SCCs after nodes (and their edges) were removed from the graph.
+        every SCC that lost nodes is searched again once
+        :param node_ids: ids of the removed nodes
+        :return: None
+        """
+        touched = set()
+        for node_id in node_ids:
+            touched.add(self.component_of.pop(node_id))
+        for component in touched:
+            specific = [node_id for node_id in self.components[component] if node_id in self.component_of]
+            if len(specific) == 0:
+                self.components.pop(component)
+                self.order.pop(component)
+            else:
+                self.components[component] = specific
+                self.split(component)
+
+    def split(self, component: int) -> None:
+        """
+        searches the nodes of an SCC for the SCCs they form now and replaces it with them
+        :param component: the SCC to search
+        :return: None
+        """
+        specific = self.components[component]
+        tarjan_of = self.tarjan(specific, self.graph.all_out_edges_of_node, set(specific))
+        count = len(set(tarjan_of.values()))
+        if count == 1:
+            return
+        base = self.order.pop(component)
+        self.components.pop(component)
+        labels = {}
+        for node_id in specific:
+            number = tarjan_of[node_id]
+            if number not in labels:
+                labels[number] = self.new_label()
+                self.components[labels[number]] = []
+                self.order[labels[number]] = base + (count - 1 - number,)
+            self.component_of[node_id] = labels[number]
+            self.components[labels[number]].append(node_id)
+        if len(base) >= MAX_ORDER_DEPTH:
+            self.flatten_orders()
+
+    def flatten_orders(self) -> None:
+        """
+        renumbers the orders of all the SCCs to (0,), (1,)... keeping their topological order
+        :return: None
+        """
+        for position, component in enumerate(sorted(self.order, key=self.order.get)):
+            self.order[component] = (position,)
+        self.next_order = len(self.order)
+
+    def reach(self, component: int, edges_of, allowed) -> set:
+        """
+        BFS over the SCCs that can be reached from an SCC
+        :param component: the SCC to start from
+        :param edges_of: function that returns the out (or in, for a backward search) edges dictionary of a node
+        :param allowed: function on the order of an SCC, SCCs it rejects are not entered
+        :return: set of the reached SCCs (including the first one)
+        """
+        reached = {component}
+        pending = [component]
+        while pending:
+            for node_id in self.components[pending.pop()]:
+                for neighbor_id in edges_of(node_id):
+                    neighbor = self.component_of[neighbor_id]
+                    if neighbor not in reached and allowed(self.order[neighbor]):
+                        reached.add(neighbor)
+                        pending.append(neighbor)
+        return reached
+
+    def new_label(self) -> int:
+        """
+        :return: an SCC number that was not used before
+        """
+        self.next_label += 1
+        return self.next_label - 1
@@ -1,5 +1,7 @@
 from GraphInterface import GraphInterface
-from NodeInfo import NodeInfo
+from NodeInfo import NodeInfo, EMPTY_EDGES
+from CompactGraph import CompactGraph
+import Instrumentation
 
 
 class DiGraph(GraphInterface):
@@ -40,13 +42,22 @@ class DiGraph(GraphInterface):
         """return a dictionary of all the nodes connected to (into) node_id ,
         each node is represented using a pair (key, weight)
          """
-        return self.nodes_list.get(id1).in_edges
+        in_edges = self.nodes_list.get(id1).in_edges
+        return {} if in_edges is EMPTY_EDGES else in_edges
 
     def all_out_edges_of_node(self, id1: int) -> dict:
         """return a dictionary of all the nodes connected from node_id , each node is represented using a pair (key,
         weight)
         """
-        return self.nodes_list.get(id1).out_edges
+        out_edges = self.nodes_list.get(id1).out_edges
+        return {} if out_edges is EMPTY_EDGES else out_edges
+
+    def get_pos(self, id1: int) -> tuple:
+        """
+        :param id1: node id
+        :return: the (x, y, z) position of the node, None if it has no position
+        """
+        return self.nodes_list.get(id1).pos
 
     def remove_node(self, node_id: int) -> bool:
         """
@@ -55,24 +66,70 @@ class DiGraph(GraphInterface):
         @return: True if the node was removed successfully, False o.w.
         if the node id does not exists the function will do nothing
         """
-        if node_id in self.nodes_list:
-            keysin = []
-            for destination_node in self.all_out_edges_of_node(node_id).keys():
-                keysin.append(destination_node)
-            for key in keysin:
-                self.remove_edge(node_id, key)
-                self.mc -= 1
-            keysout = []
-            for source_node in self.all_in_edges_of_node(node_id).keys():
-                keysout.append(source_node)
-            for key in keysout:
-                self.remove_edge(key, node_id)
-                self.mc -= 1
-            self.get_all_v().pop(node_id)
+        return self.remove_nodes([node_id]) == 1
+
+    def remove_nodes(self, node_ids) -> int:
+        """
+        Removes many nodes from the graph, i.e. deletes the subgraph they induce together with every edge
+        that touches it. Each removed node costs O(its degree): its edges are dropped from the neighbors
+        dictionaries directly, and edges between two removed nodes are not touched at all.
+        The mc changes once for the whole batch.
+        @param node_ids: iterable of node ids
+        @return: The number of nodes that were removed
+        Note: ids that do not exist are skipped
+        """
+        stats = Instrumentation.start("remove_nodes") if Instrumentation.hooks else None
+        nodes = self.nodes_list
+        removed = {}
+        for node_id in node_ids:
+            node = nodes.get(node_id)
+            if node is not None:
+                removed[node_id] = node
+        edges = 0
+        for node_id, node in removed.items():
+            edges += len(node.out_edges)
+            for dest in node.out_edges:
+                if dest not in removed:
+                    nodes[dest].in_edges.pop(node_id)
+            for src in node.in_edges:
+                if src not in removed:
+                    nodes[src].out_edges.pop(node_id)
+                    edges += 1
+        for node_id in removed:
+            nodes.pop(node_id)
+        if removed:
+            self.edge_size -= edges
             self.mc += 1
-            return True
+        if stats is not None:
+            stats.counters["nodes_removed"] += len(removed)
+            stats.counters["edges_removed"] += edges
+            stats.finish()
+        return len(removed)
 
-        return False
+    def remove_edges_from(self, edges) -> int:
+        """
+        Removes many edges from the graph, with a single mc change for the whole batch.
+        @param edges: iterable of (src, dest) pairs
+        @return: The number of edges that were removed
+        Note: edges that do not exist are skipped, like in remove_edge
+        """
+        stats = Instrumentation.start("remove_edges_from") if Instrumentation.hooks else None
+        nodes = self.nodes_list
+        removed = 0
+        for src, dest in edges:
+            source = nodes.get(src)
+            if source is None or src == dest or dest not in source.out_edges:
+                continue
+            source.out_edges.pop(dest)
+            nodes[dest].in_edges.pop(src)
+            removed += 1
+        if removed > 0:
+            self.edge_size -= removed
+            self.mc += 1
+        if stats is not None:
+            stats.counters["edges_removed"] += removed
+            stats.finish()
+        return removed
 
     def add_node(self, node_id: int, pos: tuple = None) -> bool:
         """
@@ -89,6 +146,104 @@ class DiGraph(GraphInterface):
 
         return False
 
+    def add_nodes_from(self, node_ids, positions=None) -> int:
+        """
+        Adds many nodes to the graph, with a single mc change for the whole batch.
+        @param node_ids: iterable of node ids (a list, an array, a NumPy array...)
+        @param positions: iterable of the positions of the nodes (in the same order), None for no positions
+        @return: The number of nodes that were added
+        Note: ids that already exist are skipped, like in add_node
+        """
+        stats = Instrumentation.start("add_nodes_from") if Instrumentation.hooks else None
+        node_ids = self.as_list(node_ids)
+        if positions is None:
+            positions = [None] * len(node_ids)
+        nodes = self.nodes_list
+        added = 0
+        for node_id, pos in zip(node_ids, positions):
+            if node_id not in nodes:
+                nodes[node_id] = NodeInfo(node_id, None if pos is None else tuple(pos))
+                added += 1
+        if added > 0:
+            self.mc += 1
+        if stats is not None:
+            stats.counters["nodes_added"] += added
+            stats.finish()
+        return added
+
+    def add_edges_from(self, sources, destinations=None, weights=None) -> int:
+        """
+        Adds many edges to the graph, with a single mc change for the whole batch.
+        @param sources: iterable of (src, dest, weight) triples or a NumPy (n, 3) table (see edge_columns),
+        or the start nodes of the edges if destinations and weights are given
+        @param destinations: the end nodes of the edges (parallel to sources)
+        @param weights: the weights of the edges (parallel to sources)
+        The columns can be lists, arrays or NumPy arrays.
+        @return: The number of edges that were added
+        Note: edges that already exist or have a missing node are skipped, like in add_edge
+        """
+        stats = Instrumentation.start("add_edges_from") if Instrumentation.hooks else None
+        if destinations is None and getattr(sources, "ndim", None) == 2:
+            sources, destinations, weights = self.edge_columns(sources)
+        if destinations is None:
+            edges = sources.tolist() if hasattr(sources, "tolist") else sources
+        else:
+            edges = zip(self.as_list(sources), self.as_list(destinations), self.as_list(weights))
+        nodes = self.nodes_list
+        added = 0
+        for src, dest, weight in edges:
+            source = nodes.get(src)
+            if source is None or dest not in nodes or dest in source.out_edges:
+                continue
+            source.add_out_edge(dest, weight)
+            nodes[dest].add_in_edge(src, weight)
+            added += 1
+        if added > 0:
+            self.mc += 1
+            self.edge_size += added
+        if stats is not None:
+            stats.counters["edges_added"] += added
+            stats.finish()
+        return added
+
+    @classmethod
+    def from_edges(cls, sources, destinations=None, weights=None) -> "DiGraph":
+        """
+        Builds a graph from edges, the nodes are the ends of the edges (see add_edges_from)
+        @param sources: iterable of (src, dest, weight) triples, or the start nodes of the edges
+        @param destinations: the end nodes of the edges (parallel to sources)
+        @param weights: the weights of the edges (parallel to sources)
+        @return: The new graph
+        """
+        if destinations is None:
+            sources, destinations, weights = cls.edge_columns(sources)
+        sources, destinations = cls.as_list(sources), cls.as_list(destinations)
+        graph = cls()
+        graph.add_nodes_from(dict.fromkeys(sources + destinations))
+        graph.add_edges_from(sources, destinations, weights)
+        return graph
+
+    @staticmethod
+    def edge_columns(edges) -> tuple:
+        """
+        :param edges: iterable of (src, dest, weight) triples, or a NumPy table with a row per edge
+        :return: lists of the sources, destinations and weights. the ids of a table are cast to int, since a table
+        with float weights holds its ids as floats too
+        """
+        if getattr(edges, "ndim", None) == 2:
+            return edges[:, 0].astype("int64").tolist(), edges[:, 1].astype("int64").tolist(), edges[:, 2].tolist()
+        return tuple(list(column) for column in zip(*edges)) or ([], [], [])
+
+    @staticmethod
+    def as_list(values) -> list:
+        """
+        :param values: iterable (NumPy arrays and arrays are converted with tolist, giving plain python numbers)
+        :return: list of the values
+        """
+        if hasattr(values, "tolist"):
+            return values.tolist()
+        return list(values)
+
     def add_edge(self, id1: int, id2: int, weight: float) -> bool:
         """
         Adds an edge to the graph.
@@ -122,7 +277,7 @@ class DiGraph(GraphInterface):
         """
         if node_id1 not in self.nodes_list or node_id2 not in self.nodes_list:
             return False
-        if node_id1 in self.all_in_edges_of_node(node_id2).keys() is False:
+        if node_id1 not in self.all_in_edges_of_node(node_id2):
             return False
         if node_id1 == node_id2:
             return False
@@ -142,6 +297,14 @@ class DiGraph(GraphInterface):
             return False
         return True
 
+    def freeze(self) -> CompactGraph:
+        """
+        Returns an immutable compressed sparse row (CSR) snapshot of this graph,
+        later changes to this graph do not affect the snapshot.
+        @return: CompactGraph with the nodes, edges and mc of this graph
+        """
+        return CompactGraph.from_graph(self)
+
     def as_dict(self):
         list_of_nodes = []
         list_of_edges = []
@@ -161,4 +324,9 @@ class DiGraph(GraphInterface):
         return ans
 
     def __eq__(self, other):
-        return self.nodes_list.__eq__(other.nodes_list)
+        if isinstance(other, DiGraph):
+            return self.nodes_list.__eq__(other.nodes_list)
+        if not isinstance(other, GraphInterface) or self.get_all_v().keys() != other.get_all_v().keys():
+            return False
+        return all(self.get_pos(key) == other.get_pos(key)
+                   and self.all_out_edges_of_node(key) == other.all_out_edges_of_node(key) for key in self.get_all_v())
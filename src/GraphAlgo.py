@@ -1,22 +1,53 @@
 import math
 from typing import List
-from NodeInfo import NodeInfo
 from GraphInterface import GraphInterface
 from AlgoInterface import GraphAlgoInterface
 from DiGraph import DiGraph as Graph
-from matplotlib import pyplot as plt
+from CompactGraph import CompactGraph
+from ComponentsIndex import ComponentsIndex
+from ShortestPathTree import ShortestPathTree
+from collections import OrderedDict
+from JsonGraphReader import JsonGraphReader
+from JsonGraphWriter import JsonGraphWriter
+import ParallelQueries
+import Instrumentation
+from AsyncQueries import AsyncQueries
+from ScipyBackend import ScipyBackend
+from Reachability import Reachability
+from ReversedGraph import ReversedGraph
 import random as rand
-import queue
-import json
+import heapq
+import threading
+import gzip
+import time
+from types import SimpleNamespace
 
 identifier = 0
+EDGES_BATCH = 1 << 14
+FLOYD_WARSHALL_NODES = 1500
+FLOYD_WARSHALL_BLOCK = 256
+FLOYD_WARSHALL_DENSITY = 64
 
 
 class GraphAlgo(GraphAlgoInterface):
     """This class represents a directed weighted graph."""
 
-    def __init__(self, graph: GraphInterface = None):
+    def __init__(self, graph: GraphInterface = None, heuristic_scale: float = None, tree_cache_size: int = 32,
+                 executor=None, backend: str = "python"):
         self.graph = graph
+        self.heuristic_scale = heuristic_scale
+        self.tree_cache_size = tree_cache_size
+        self.tree_cache = OrderedDict()
+        self.tree_cache_lock = threading.Lock()
+        self.clear_caches()
+        self.async_queries = AsyncQueries(self, executor)
+        if backend == "auto":
+            backend = "scipy" if ScipyBackend.available() else "python"
+        if backend not in ("python", "scipy", "parity"):
+            raise ValueError("unknown backend: " + str(backend))
+        if backend != "python" and not ScipyBackend.available():
+            raise ImportError("the " + backend + " backend needs scipy")
+        self.backend = backend
 
     def get_graph(self) -> GraphInterface:
         """
@@ -24,86 +55,681 @@ class GraphAlgo(GraphAlgoInterface):
         """
         return self.graph
 
+    def clear_caches(self) -> None:
+        """
+        drops everything that was computed for a graph (positions scale, SCCs, shortest path trees, CSR snapshot
+        and what is built on it), so a replaced graph is not kept alive by the caches
+        :return: None
+        """
+        self.scale_cache = (None, -1, 0, False)
+        self.components_cache = None
+        with self.tree_cache_lock:
+            self.tree_cache.clear()
+        self.compact_cache = (None, -1, None)
+        self.backend_cache = (None, None)
+        self.reachability_cache = (None, None)
+
     def load_from_json(self, file_name: str) -> bool:
         """
-        loads the graph in JSON format to a file
+        loads the graph in JSON format to a file (plain or gzip compressed)
         @param file_name: The path to the load file
         @return: True if the load was successful, False o.w.
+        The file is parsed one node/edge record at a time (see JsonGraphReader) and the records go straight
+        into the graph. The edges are added in batches (see DiGraph.add_edges_from), edges that come before
+        the nodes are kept until the nodes are loaded. The ids and weights are stored as the file has them.
         """
         try:
-            with open(file_name, "r") as file:
-                graph_dict = json.load(file)
-                nodes = graph_dict.get("Nodes")
-                edges = graph_dict.get("Edges")
+            stats = Instrumentation.start("load_from_json") if Instrumentation.hooks else None
+            with self.open_json(file_name) as file:
                 graph = Graph()
-                tup = None
-                for node_dict in nodes:
-                    pos_string = node_dict.get("pos")
-                    if pos_string is not None:
-                        x = float(pos_string.split(",")[0])
-                        y = float(pos_string.split(",")[1])
-                        z = float(pos_string.split(",")[2])
-                        tup = (x, y, z)
-
-                    graph.add_node(node_dict.get("id"), tup)
-                for edge_dict in edges:
-                    src = edge_dict.get('src')
-                    weight = edge_dict.get('w')
-                    dest = edge_dict.get('dest')
-                    graph.add_edge(src, dest, weight)
+                add_node, add_edges_from = graph.add_node, graph.add_edges_from
+                if stats is not None:
+                    add_node, add_edges_from = stats.timed(add_node, "nodes"), stats.timed(add_edges_from, "edges")
+                pending = ([], [], [])
+                for key, record in JsonGraphReader(file).records():
+                    if key == "Nodes":
+                        add_node(record.get("id"), self.parse_pos(record.get("pos")))
+                    elif key == "Edges":
+                        pending[0].append(record.get('src'))
+                        pending[1].append(record.get('dest'))
+                        pending[2].append(record.get('w'))
+                        if len(pending[0]) >= EDGES_BATCH and graph.v_size() > 0:
+                            add_edges_from(*pending)
+                            pending = ([], [], [])
+                add_edges_from(*pending)
                 self.graph = graph
-                return True
+                self.clear_caches()
+            if stats is not None:
+                stats.timings["parse"] = time.perf_counter() - stats.start - sum(stats.timings.values())
+                stats.counters["nodes"], stats.counters["edges"] = graph.v_size(), graph.e_size()
+                stats.finish()
+            return True
 
         except IOError as e:
             return False
 
-    def save_to_json(self, file_name: str) -> bool:
+    def open_json(self, file_name: str):
+        """
+        opens a json file for reading, gzip files are detected by their first bytes
+        :param file_name: The path to the file
+        :return: the opened text file
+        """
+        with open(file_name, "rb") as file:
+            compressed = file.read(2) == b"\x1f\x8b"
+        if compressed:
+            return gzip.open(file_name, "rt")
+        return open(file_name, "r")
+
+    def parse_pos(self, pos_string: str):
+        """
+        :param pos_string: position in the json format "x,y,z"
+        :return: (x, y, z) tuple of floats, None if pos_string is None
+        """
+        if pos_string is None:
+            return None
+        x, y, z = pos_string.split(",")
+        return float(x), float(y), float(z)
+
+    def save_to_json(self, file_name: str, compact: bool = False, compress: bool = None) -> bool:
         """
         Saves the graph in JSON format to a file
         @param file_name: The path to the out file
+        @param compact: write without indentation and spaces
+        @param compress: write a gzip file, by default only if file_name ends with ".gz"
         @return: True if the save was successful, False o.w.
+        The nodes and edges are written one record at a time (see JsonGraphWriter)
         """
         try:
             graph = self.get_graph()
-            graph_dict = graph.as_dict()
+            if compress is None:
+                compress = file_name.endswith(".gz")
+            if compress:
+                file = gzip.open(file_name, "wt")
+            else:
+                file = open(file_name, "w")
+            stats = Instrumentation.start("save_to_json") if Instrumentation.hooks else None
+            with file:
+                out = file if stats is None else SimpleNamespace(write=stats.timed(file.write, "write"))
+                JsonGraphWriter(out, compact).write(graph)
+            if stats is not None:
+                stats.timings["encode"] = time.perf_counter() - stats.start - stats.timings.get("write", 0.0)
+                stats.counters["nodes"], stats.counters["edges"] = graph.v_size(), graph.e_size()
+                stats.finish()
+            return True
+        except IOError as e:
+            print(e)
+            return False
 
-            with open(file_name, "w") as file:
-                json.dump(graph_dict, indent=4, fp=file)
+    def save_to_binary(self, file_name: str) -> bool:
+        """
+        Saves the graph in the binary CSR format of CompactGraph (see CompactGraph.save_binary)
+        @param file_name: The path to the out file
+        @return: True if the save was successful, False o.w.
+        """
+        try:
+            graph = self.get_graph()
+            if not isinstance(graph, CompactGraph):
+                graph = CompactGraph.from_graph(graph)
+            graph.save_binary(file_name)
             return True
         except IOError as e:
             print(e)
             return False
 
-    def shortest_path(self, id1: int, id2: int) -> (float, list):
+    def load_from_binary(self, file_name: str, use_mmap: bool = True) -> bool:
+        """
+        Loads a graph saved by save_to_binary as a CompactGraph.
+        With use_mmap the file is memory mapped instead of read, so the graph is usable right away
+        and processes that load the same file share it
+        @param file_name: The path to the load file
+        @param use_mmap: map the file instead of reading it
+        @return: True if the load was successful, False o.w.
+        """
+        try:
+            self.graph = CompactGraph.load_binary(file_name, use_mmap)
+            self.clear_caches()
+            return True
+        except (IOError, ValueError):
+            return False
+
+    def shortest_path(self, id1: int, id2: int, method: str = "dijkstra") -> (float, list):
         """
         Returns the shortest path from node id1 to node id2 using Dijkstra's Algorithm
         @param id1: The start node id
         @param id2: The end node id
+        @param method: "dijkstra" for a forward search,
+        "bidirectional" for a search from both ends that meets in the middle (same distances, fewer settled nodes),
+        "astar" for a search directed to id2 by the euclidean distance between the node positions
+        (see heuristic_scale, falls back to dijkstra when some node has no position)
         @return: The distance of the path, a list of the nodes ids that the path goes through
         Notes:
         If there is no path between id1 and id2, or one of them dose not exist the function returns (float('inf'),[])
-
+        With the scipy backend (GraphAlgo(graph, backend="scipy")) the "dijkstra" method runs scipy's Dijkstra
+        The query only reads the graph and keeps its state locally,
+        so concurrent calls (threads or forked processes) on the same graph are safe.
         """
-        if self.get_graph() is None:
+        graph = self.get_graph()
+        if graph is None:
             return float('inf'), []
-        if id1 not in self.get_graph().get_all_v() or id2 not in self.get_graph().get_all_v():
+        if id1 not in graph.get_all_v() or id2 not in graph.get_all_v():
             return float('inf'), []
         if id1 == id2:
             return (0,[id1])
-        destination_node = self.get_graph().get_all_v().get(id2)
-        source_node = self.get_graph().get_all_v().get(id1)
-        predecessors = self.dijkstra_algorithm(source_node)
-        if destination_node.weight == -1:
+        if method == "dijkstra" and self.backend != "python":
+            return self.on_backend(graph, "shortest_path", (id1, id2), lambda: GraphAlgo(graph).shortest_path(id1, id2))
+        if method == "bidirectional":
+            return self.bidirectional_dijkstra(id1, id2, graph)
+        if method == "astar":
+            distances, predecessors = self.a_star(id1, id2, graph)
+        elif method == "dijkstra":
+            tree = self.cached_tree(id1, graph)
+            if tree is not None:
+                return tree.path(id2)
+            if isinstance(graph, CompactGraph):
+                return self.compact_path(graph, id1, id2)
+            distances, predecessors = self.dijkstra_algorithm(id1, id2, graph)
+        else:
+            raise ValueError("unknown shortest path method: " + str(method))
+        return ShortestPathTree(id1, distances, predecessors).path(id2)
+
+    def shortest_path_tree(self, id1: int) -> ShortestPathTree:
+        """
+        Returns the shortest paths from node id1 to every node it reaches, using Dijkstra's Algorithm.
+        Any number of paths can be taken from the result (see ShortestPathTree.path).
+        The last tree_cache_size trees are kept until the mc of the graph changes (the outdated ones are dropped
+        when a new tree is added), and shortest_path from their source uses them too
+        @param id1: The source node id
+        @return: ShortestPathTree from id1 (an empty one if the graph is None or id1 is not in the graph)
+        """
+        graph = self.get_graph()
+        if graph is None or id1 not in graph.get_all_v():
+            return ShortestPathTree(id1, {}, {})
+        tree = self.cached_tree(id1, graph)
+        if tree is None:
+            mc = graph.get_mc()
+            distances, predecessors = self.dijkstra_algorithm(id1, None, graph)
+            tree = ShortestPathTree(id1, distances, predecessors, mc)
+            with self.tree_cache_lock:
+                for key in [key for key, cached in self.tree_cache.items() if key[1] != mc or cached[0] is not graph]:
+                    del self.tree_cache[key]
+                self.tree_cache[(id1, mc)] = (graph, tree)
+                self.tree_cache.move_to_end((id1, mc))
+                while len(self.tree_cache) > self.tree_cache_size:
+                    self.tree_cache.popitem(last=False)
+        return tree
+
+    def cached_tree(self, id1: int, graph: GraphInterface = None):
+        """
+        :param id1: the source node id
+        :param graph: the graph, the graph of this object by default
+        :return: the cached ShortestPathTree from id1 for the current mc of the graph, None if there is none
+        """
+        if graph is None:
+            graph = self.get_graph()
+        key = (id1, graph.get_mc())
+        with self.tree_cache_lock:
+            cached = self.tree_cache.get(key)
+            if cached is None or cached[0] is not graph:
+                return None
+            self.tree_cache.move_to_end(key)
+            return cached[1]
+
+    def distance_matrix(self, sources, targets=None, workers: int = 1):
+        """
+        Computes the shortest path distances from every source to every target,
+        with one Dijkstra's run per source that stops once all the targets are settled.
+        @param sources: iterable of source node ids
+        @param targets: iterable of target node ids, the sources by default
+        @param workers: number of processes to spread the sources on (see ParallelQueries.run),
+        1 computes everything in this process and None uses every cpu
+        @return: NumPy array of shape (len(sources), len(targets)),
+        inf where there is no path or one of the nodes does not exist
+        """
+        import numpy as np
+        sources = list(sources)
+        targets = sources if targets is None else list(targets)
+        matrix = np.full((len(sources), len(targets)), np.inf)
+        if self.get_graph() is None or len(sources) == 0 or len(targets) == 0:
+            return matrix
+        rows = ParallelQueries.run(self, "target_distances", [(source, targets) for source in sources], workers)
+        for row, distances in enumerate(rows):
+            matrix[row] = distances
+        return matrix
+
+    def target_distances(self, source: int, targets: list, graph: GraphInterface = None) -> list:
+        """
+        :param source: the source node id
+        :param targets: list of target node ids
+        :param graph: the graph, the graph of this object by default
+        :return: list of the shortest path distances from the source to the targets (inf where there is no path)
+        """
+        if graph is None:
+            graph = self.get_graph()
+        if source not in graph.get_all_v():
+            return [math.inf] * len(targets)
+        tree = self.cached_tree(source, graph)
+        if tree is not None:
+            distances = tree.distances
+        else:
+            wanted = [target for target in targets if target in graph.get_all_v()]
+            distances = self.dijkstra_algorithm(source, None, graph, wanted)[0]
+        return [distances.get(target, math.inf) for target in targets]
+
+    def shortest_paths(self, pairs, workers: int = 1) -> list:
+        """
+        Answers a batch of shortest path queries.
+        The pairs are grouped by their start node, so every start node runs Dijkstra's algorithm once
+        (stopping when all of its end nodes are settled), and the groups are spread on a pool of processes.
+        @param pairs: iterable of (id1, id2) pairs
+        @param workers: number of processes to spread the groups on (see ParallelQueries.run),
+        1 computes everything in this process and None uses every cpu
+        @return: list of (distance, path) in the order of the pairs, as shortest_path returns them
+        """
+        pairs = [(id1, id2) for id1, id2 in pairs]
+        if self.get_graph() is None:
+            return [(float('inf'), []) for pair in pairs]
+        groups = {}
+        for id1, id2 in pairs:
+            groups.setdefault(id1, {})[id2] = None
+        results = ParallelQueries.run(self, "source_paths", [(id1, list(targets)) for id1, targets in groups.items()],
+                                      workers)
+        answers = {}
+        for (id1, targets), paths in zip(groups.items(), results):
+            for id2, answer in zip(targets, paths):
+                answers[(id1, id2)] = answer
+        return [(answers[pair][0], list(answers[pair][1])) for pair in pairs]
+
+    def source_paths(self, source: int, targets: list, graph: GraphInterface = None) -> list:
+        """
+        :param source: the start node id
+        :param targets: list of end node ids
+        :param graph: the graph, the graph of this object by default
+        :return: list of the (distance, path) of the shortest paths from the source to the targets
+        """
+        if graph is None:
+            graph = self.get_graph()
+        if source not in graph.get_all_v():
+            return [(float('inf'), []) for target in targets]
+        tree = self.cached_tree(source, graph)
+        if tree is None:
+            wanted = [target for target in targets if target in graph.get_all_v()]
+            tree = ShortestPathTree(source, *self.dijkstra_algorithm(source, None, graph, wanted))
+        return [tree.path(target) for target in targets]
+
+    def all_pairs_shortest_paths(self, method: str = "auto", workers: int = 1):
+        """
+        Computes the shortest paths between every pair of nodes.
+        @param method: "floyd_warshall" for a NumPy vectorized Floyd-Warshall (O(|V|^3) but fast for small graphs),
+        "dijkstra" for Dijkstra's algorithm from every node on the CSR arrays of the graph,
+        "auto" picks floyd_warshall for graphs of up to FLOYD_WARSHALL_NODES nodes that are dense enough
+        (|V|^2 <= FLOYD_WARSHALL_DENSITY * (|E| + |V|)) and dijkstra o.w., with the scipy backend "auto" runs
+        scipy.sparse.csgraph.shortest_path
+        @param workers: number of processes for the dijkstra method (see ParallelQueries.run)
+        @return: (keys, distances, next_hops): keys is the list of the node ids in the order of the matrices rows,
+        distances[i][j] is the distance from keys[i] to keys[j] (inf if there is no path), and next_hops[i][j]
+        is the index (in keys) of the node after keys[i] on that path (-1 if there is no path)
+        """
+        import numpy as np
+        graph = self.get_graph()
+        if graph is None:
+            return [], np.zeros((0, 0)), np.zeros((0, 0), dtype=np.int64)
+        compact = self.compact(graph)
+        if method == "auto" and self.backend != "python":
+            return self.on_backend(graph, "all_pairs_shortest_paths", (),
+                                   lambda: GraphAlgo(graph).all_pairs_shortest_paths(method, workers))
+        if method == "auto":
+            size = compact.v_size()
+            dense = size * size <= FLOYD_WARSHALL_DENSITY * (compact.e_size() + size)
+            method = "floyd_warshall" if size <= FLOYD_WARSHALL_NODES and dense else "dijkstra"
+        if method == "floyd_warshall":
+            distances, next_hops = self.floyd_warshall(compact)
+        elif method == "dijkstra":
+            size = compact.v_size()
+            rows = ParallelQueries.run(GraphAlgo(compact), "next_hops_row",
+                                       [(source,) for source in range(size)], workers)
+            distances = np.array([row[0] for row in rows], dtype=np.float64).reshape(size, size)
+            next_hops = np.array([row[1] for row in rows], dtype=np.int64).reshape(size, size)
+        else:
+            raise ValueError("unknown all pairs method: " + str(method))
+        return list(compact.keys), distances, next_hops
+
+    def floyd_warshall(self, compact: CompactGraph):
+        """
+        Floyd-Warshall on NumPy matrices. for every middle node k the rows are relaxed in blocks of
+        FLOYD_WARSHALL_BLOCK rows, so the temporary matrices stay small enough for the cache
+        (row k and column k do not change while k is the middle node, so updating in place is safe)
+        :param compact: the CSR graph
+        :return: distances matrix, next hops matrix (see all_pairs_shortest_paths)
+        """
+        import numpy as np
+        size = compact.v_size()
+        distances = np.full((size, size), np.inf)
+        next_hops = np.full((size, size), -1, dtype=np.int64)
+        sources = np.repeat(np.arange(size), np.diff(np.asarray(compact.offsets, dtype=np.int64)))
+        destinations = np.asarray(compact.neighbors, dtype=np.int64)
+        distances[sources, destinations] = np.asarray(compact.weights, dtype=np.float64)
+        next_hops[sources, destinations] = destinations
+        distances[np.arange(size), np.arange(size)] = 0
+        next_hops[np.arange(size), np.arange(size)] = np.arange(size)
+        for middle in range(size):
+            to_middle_row = distances[middle]
+            for start in range(0, size, FLOYD_WARSHALL_BLOCK):
+                block = slice(start, start + FLOYD_WARSHALL_BLOCK)
+                through = distances[block, middle, None] + to_middle_row
+                better = through < distances[block]
+                if better.any():
+                    distances[block][better] = through[better]
+                    next_hops[block][better] = np.broadcast_to(next_hops[block, middle, None], better.shape)[better]
+        return distances, next_hops
+
+    def next_hops_row(self, source: int):
+        """
+        one row of the all pairs matrices, the graph of this object must be a CompactGraph
+        :param source: index of the source node
+        :return: list of the distances from the source, list of the next hop index towards every node
+        """
+        distances, predecessors, order = self.get_graph().dijkstra(source)
+        next_hops = [-1] * len(distances)
+        next_hops[source] = source
+        for node in order[1:]:
+            predecessor = predecessors[node]
+            next_hops[node] = node if predecessor == source else next_hops[predecessor]
+        return distances, next_hops
+
+    def compact(self, graph: GraphInterface = None) -> CompactGraph:
+        """
+        :param graph: the graph, the graph of this object by default
+        :return: the graph itself if it is a CompactGraph, o.w. a CSR snapshot of it cached until its mc changes
+        """
+        if graph is None:
+            graph = self.get_graph()
+        if isinstance(graph, CompactGraph):
+            return graph
+        cached_graph, cached_mc, compact = self.compact_cache
+        if cached_graph is graph and cached_mc == graph.get_mc():
+            return compact
+        compact = CompactGraph.from_graph(graph)
+        self.compact_cache = (graph, compact.get_mc(), compact)
+        return compact
+
+    def eccentricities(self, workers: int = 1) -> dict:
+        """
+        Computes the eccentricity of every node - the distance to the node that is farthest from it.
+        Only the nodes of an SCC that no edge enters can reach every node, so only they are swept.
+        @param workers: number of processes for the sweeps (see ParallelQueries.run)
+        @return: dictionary of the eccentricity of every node id (inf if the node does not reach every node)
+        """
+        graph = self.get_graph()
+        if graph is None:
+            return {}
+        compact = self.compact(graph)
+        candidates = self.center_candidates(graph, compact)
+        values = ParallelQueries.run(GraphAlgo(compact), "eccentricity_of", [(index,) for index in candidates],
+                                     workers)
+        eccentricities = dict.fromkeys(compact.keys, math.inf)
+        for index, value in zip(candidates, values):
+            eccentricities[compact.keys[index]] = value
+        return eccentricities
+
+    def center(self, workers: int = 1) -> (int, float):
+        """
+        Finds the center of the graph - the node with the smallest eccentricity.
+        The nodes are swept only until the bounds of the others show that they cannot beat the best one found
+        (see extreme_eccentricity).
+        @param workers: number of processes for the sweeps, every round of sweeps runs one node per process
+        @return: (id of the center node, its eccentricity), (None, inf) if no node reaches every node
+        """
+        graph = self.get_graph()
+        if graph is None:
+            return None, math.inf
+        compact = self.compact(graph)
+        candidates = self.center_candidates(graph, compact)
+        if len(candidates) == 0:
+            return None, math.inf
+        index, eccentricity = self.extreme_eccentricity(compact, candidates, False, workers)
+        return compact.keys[index], eccentricity
+
+    def diameter(self, workers: int = 1) -> float:
+        """
+        Computes the diameter of the graph - the largest eccentricity (the length of the longest shortest path).
+        It is finite only when the graph is a single SCC, and then the nodes are swept only until the bounds of the
+        others show that none of them is farther (see extreme_eccentricity).
+        @param workers: number of processes for the sweeps, every round of sweeps runs one node per process
+        @return: the diameter, inf if some node does not reach another one (or the graph is empty)
+        """
+        graph = self.get_graph()
+        if graph is None or graph.v_size() == 0:
+            return math.inf
+        compact = self.compact(graph)
+        candidates = self.center_candidates(graph, compact)
+        if len(candidates) != compact.v_size():
+            return math.inf
+        return self.extreme_eccentricity(compact, candidates, True, workers)[1]
+
+    def extreme_eccentricity(self, compact: CompactGraph, candidates: list, largest: bool, workers: int = 1):
+        """
+        finds the smallest (or largest) eccentricity among nodes that reach every node.
+        a sweep from a node u and a sweep to it bound the eccentricity of every other node v:
+        max(d(v, u), ecc(u) - d(u, v)) <= ecc(v) <= d(v, u) + ecc(u).
+        every round sweeps the nodes with the most promising bounds, alternating with the nodes at the other end
+        (they tighten the bounds of the rest the most), and drops the nodes whose bounds cannot beat the best value
+        :param compact: the CSR graph
+        :param candidates: indexes of nodes that reach every node
+        :param largest: look for the largest eccentricity instead of the smallest
+        :param workers: number of processes for the sweeps
+        :return: (index of the node, its eccentricity)
+        """
+        import numpy as np
+        candidates = np.array(candidates, dtype=np.int64)
+        lower = np.zeros(len(candidates))
+        upper = np.full(len(candidates), np.inf)
+        active = np.ones(len(candidates), dtype=bool)
+        best, best_index = (-math.inf if largest else math.inf), -1
+        algo = GraphAlgo(compact)
+        round_size = ParallelQueries.workers_count(workers)
+        rounds = 0
+        with ParallelQueries.pool(algo, workers) as executor:
+            while active.any():
+                positions = np.flatnonzero(active)
+                if (rounds % 2 == 0) == largest:
+                    positions = positions[np.argsort(-upper[positions], kind="stable")]
+                else:
+                    positions = positions[np.argsort(lower[positions], kind="stable")]
+                positions = positions[:round_size]
+                rounds += 1
+                sweeps = ParallelQueries.run(algo, "sweeps_of", [(candidates[position],) for position in positions],
+                                             workers, executor)
+                for position, (from_node, to_node) in zip(positions, sweeps):
+                    eccentricity = max(from_node)
+                    from_node = np.array(from_node)[candidates]
+                    to_node = np.array(to_node)[candidates]
+                    np.maximum(lower, np.maximum(to_node, eccentricity - from_node), out=lower)
+                    np.minimum(upper, to_node + eccentricity, out=upper)
+                    lower[position] = upper[position] = eccentricity
+                    active[position] = False
+                exact = lower == upper
+                if largest:
+                    if lower.max() > best:
+                        best_index = int(np.argmax(lower))
+                        best = lower[best_index]
+                    active &= upper > best
+                else:
+                    if (exact & (upper < best)).any():
+                        best_index = int(np.argmin(np.where(exact, upper, np.inf)))
+                        best = upper[best_index]
+                    active &= lower < best
+                active &= ~exact
+        return candidates[best_index], float(best)
+
+    def center_candidates(self, graph: GraphInterface, compact: CompactGraph) -> list:
+        """
+        the nodes that can reach every node are the nodes of the only SCC that no edge enters
+        :param graph: the graph
+        :param compact: the CSR snapshot of the graph
+        :return: list of the indexes (in compact) of these nodes, empty if there are several such SCCs
+        """
+        component_of, components = self.components_index(graph)
+        entered = set()
+        for node_id, component in component_of.items():
+            for neighbor_id in graph.all_out_edges_of_node(node_id):
+                if component_of[neighbor_id] != component:
+                    entered.add(component_of[neighbor_id])
+        sources = [component for component in components if component not in entered]
+        if len(sources) != 1:
+            return []
+        return [compact.index_of[node_id] for node_id in components[sources[0]]]
+
+    def eccentricity_of(self, source: int) -> float:
+        """
+        one sweep of the eccentricities, the graph of this object must be a CompactGraph
+        :param source: index of the node
+        :return: the eccentricity of the node (inf if it does not reach every node)
+        """
+        return max(self.get_graph().dijkstra(source)[0])
+
+    def sweeps_of(self, source: int):
+        """
+        a sweep from a node and a sweep to it, the graph of this object must be a CompactGraph
+        :param source: index of the node
+        :return: list of the distances from the node, list of the distances to the node
+        """
+        compact = self.get_graph()
+        return compact.dijkstra(source)[0], compact.dijkstra(source, reverse=True)[0]
+
+    async def shortest_path_async(self, id1: int, id2: int, method: str = "dijkstra", timeout: float = None):
+        """
+        shortest_path for asyncio code: the query runs on the executor of this object (the default executor of the
+        event loop unless one was given to the constructor) and identical queries in flight share one run
+        (see AsyncQueries.call)
+        @param timeout: seconds to wait for the result, asyncio.TimeoutError is raised after them
+        @return: The distance of the path, a list of the nodes ids that the path goes through
+        """
+        return await self.async_queries.call("shortest_path", (id1, id2, method), timeout)
+
+    async def shortest_paths_async(self, pairs, workers: int = 1, timeout: float = None) -> list:
+        """
+        shortest_paths for asyncio code (see shortest_path_async)
+        @param timeout: seconds to wait for the result, asyncio.TimeoutError is raised after them
+        @return: list of (distance, path) in the order of the pairs
+        """
+        pairs = tuple((id1, id2) for id1, id2 in pairs)
+        return await self.async_queries.call("shortest_paths", (pairs, workers), timeout)
+
+    async def connected_component_async(self, id1: int, timeout: float = None) -> list:
+        """
+        connected_component for asyncio code (see shortest_path_async)
+        @param timeout: seconds to wait for the result, asyncio.TimeoutError is raised after them
+        @return: The list of nodes in the SCC
+        """
+        return await self.async_queries.call("connected_component", (id1,), timeout)
+
+    async def connected_components_async(self, timeout: float = None) -> List[list]:
+        """
+        connected_components for asyncio code (see shortest_path_async)
+        @param timeout: seconds to wait for the result, asyncio.TimeoutError is raised after them
+        @return: The list all SCC
+        """
+        return await self.async_queries.call("connected_components", (), timeout)
+
+    def on_backend(self, graph: GraphInterface, name: str, arguments: tuple, python_query):
+        """
+        answers a query with the scipy backend, in the parity backend the python implementation answers it too
+        and the answers are compared (see ScipyBackend.check)
+        :param graph: the graph
+        :param name: name of the ScipyBackend method
+        :param arguments: arguments tuple of the method
+        :param python_query: function that answers the query in python
+        :return: the answer of the scipy backend
+        """
+        compact = self.compact(graph)
+        cached_compact, backend = self.backend_cache
+        if cached_compact is not compact:
+            backend = ScipyBackend(compact)
+            self.backend_cache = (compact, backend)
+        answer = getattr(backend, name)(*arguments)
+        if self.backend == "parity":
+            backend.check(name, answer, python_query())
+        return answer
+
+    def reachable_from(self, id1: int, max_hops: int = None, reverse: bool = False) -> list:
+        """
+        Finds the nodes that node id1 reaches, ignoring the weights (BFS, see Reachability).
+        @param id1: The start node id
+        @param max_hops: if given, only nodes that are at most max_hops edges away
+        @param reverse: find the nodes that reach id1 instead
+        @return: list of the nodes ids in BFS order (id1 first), empty if id1 is not in the graph
+        """
+        graph = self.get_graph()
+        if graph is None or id1 not in graph.get_all_v():
+            return []
+        engine = self.reachability(graph)
+        keys = engine.compact.keys
+        return [keys[index] for index in engine.search(engine.compact.index_of[id1], max_hops, -1, reverse)[0]]
+
+    def can_reach(self, id1: int, id2: int, max_hops: int = None) -> bool:
+        """
+        Checks if there is a path from node id1 to node id2, the search stops once id2 is reached.
+        @param id1: The start node id
+        @param id2: The end node id
+        @param max_hops: if given, only paths of at most max_hops edges count
+        @return: True if id2 is reachable from id1, False o.w. (or if one of them is not in the graph)
+        """
+        return self.unweighted_shortest_path(id1, id2, max_hops)[0] != float('inf')
+
+    def unweighted_shortest_path(self, id1: int, id2: int, max_hops: int = None) -> (float, list):
+        """
+        Finds the path from node id1 to node id2 with the fewest edges (BFS, ignoring the weights).
+        @param id1: The start node id
+        @param id2: The end node id
+        @param max_hops: if given, only paths of at most max_hops edges count
+        @return: the number of edges in the path, a list of the nodes ids that the path goes through,
+        (float('inf'), []) if there is no such path or one of the nodes is not in the graph
+        """
+        graph = self.get_graph()
+        if graph is None or id1 not in graph.get_all_v() or id2 not in graph.get_all_v():
             return float('inf'), []
-        ans1 = destination_node.weight
-        ans2 = [destination_node.key]
-        destination_node = predecessors.get(destination_node.key)
-        while destination_node.key != id1:
-            ans2.append(destination_node.key)
-            destination_node = predecessors.get(destination_node.key)
-        ans2.append(destination_node.key)
-        ans2.reverse()
-        return ans1, ans2
+        engine = self.reachability(graph)
+        index_of, keys = engine.compact.index_of, engine.compact.keys
+        source, target = index_of[id1], index_of[id2]
+        order, starts, parents = engine.search(source, max_hops, target)
+        if order[-1] != target:
+            return float('inf'), []
+        path = [target]
+        while path[-1] != source:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return len(path) - 1, [keys[index] for index in path]
+
+    def hop_distances(self, id1: int, max_hops: int = None) -> dict:
+        """
+        Computes the number of edges on the shortest unweighted path from node id1 to every node it reaches.
+        @param id1: The start node id
+        @param max_hops: if given, only nodes that are at most max_hops edges away
+        @return: dictionary of the hops of every reached node id, empty if id1 is not in the graph
+        """
+        graph = self.get_graph()
+        if graph is None or id1 not in graph.get_all_v():
+            return {}
+        engine = self.reachability(graph)
+        keys = engine.compact.keys
+        order, starts, parents = engine.search(engine.compact.index_of[id1], max_hops)
+        hops = {}
+        for level, start in enumerate(starts):
+            end = starts[level + 1] if level + 1 < len(starts) else len(order)
+            hops.update(dict.fromkeys([keys[index] for index in order[start:end]], level))
+        return hops
+
+    def reachability(self, graph: GraphInterface = None) -> Reachability:
+        """
+        :param graph: the graph, the graph of this object by default
+        :return: the BFS engine over the CSR snapshot of the graph (see compact), cached with the snapshot
+        """
+        compact = self.compact(graph)
+        cached_compact, engine = self.reachability_cache
+        if cached_compact is not compact:
+            engine = Reachability(compact)
+            self.reachability_cache = (compact, engine)
+        return engine
 
     def connected_component(self, id1: int) -> list:
         """
@@ -112,14 +738,16 @@ class GraphAlgo(GraphAlgoInterface):
         @return: The list of nodes in the SCC
         Notes:
         If the graph is None or id1 is not in the graph, the function should return an empty list []
+        The SCCs are computed once and reused until the mc of the graph changes (see components_index),
+        the list starts with id1 followed by the other nodes in the order of the cached component
         """
-        if self.get_graph() is None:
+        graph = self.get_graph()
+        if graph is None:
             return []
-        if id1 not in self.get_graph().get_all_v():
+        if id1 not in graph.get_all_v():
             return []
-        reversed = self.reversed_graph()
-
-        return self.bfs_twice(id1, {}, [], reversed)
+        component_of, components = self.components_index(graph)
+        return [id1] + [node_id for node_id in components[component_of[id1]] if node_id != id1]
 
     def connected_components(self) -> List[list]:
         """
@@ -127,163 +755,470 @@ class GraphAlgo(GraphAlgoInterface):
         @return: The list all SCC
         Notes:
         If the graph is None the function return an empty list []
+        The components are found with Tarjan's algorithm in O(|V|+|E|), each list starts with its first node
+        in get_all_v() order followed by the other nodes in BFS order over the in edges.
+        With the scipy backend (GraphAlgo(graph, backend="scipy")) scipy.sparse.csgraph finds them, and the nodes
+        of every list are in get_all_v() order
         """
-        if self.get_graph() is None:
+        graph = self.get_graph()
+        if graph is None:
             return []
-        total = {}
-        ans = []
-        reversed = self.reversed_graph()
-        for id in self.get_graph().get_all_v():
-            if id not in total:
-                ans.append(self.bfs_twice(id, total, [], reversed))
+        if self.backend != "python":
+            return self.on_backend(graph, "connected_components", (), lambda: GraphAlgo(graph).connected_components())
+        component_of, components = self.components_index(graph)
+        return [list(specific) for specific in components.values()]
 
-        return ans
+    def same_component(self, id1: int, id2: int) -> bool:
+        """
+        Checks if two nodes are in the same Strongly Connected Component(SCC), i.e. each is reachable from the other.
+        @param id1: The first node id
+        @param id2: The second node id
+        @return: True if both nodes are in the graph and in the same SCC, False o.w.
+        """
+        graph = self.get_graph()
+        if graph is None:
+            return False
+        if id1 not in graph.get_all_v() or id2 not in graph.get_all_v():
+            return False
+        component_of, components = self.components_index(graph)
+        return component_of[id1] == component_of[id2]
+
+    def components_index(self, graph: GraphInterface = None):
+        """
+        the SCCs of the graph, cached until the mc of the graph changes.
+        edits made with add_node, add_edge, remove_edge and remove_node of this object update the cache in place
+        :param graph: the graph, the graph of this object by default
+        :return: dictionary of the SCC number of every node, dictionary of the nodes list of every SCC number
+        """
+        if graph is None:
+            graph = self.get_graph()
+        index = self.current_components(graph)
+        if index is None:
+            stats = Instrumentation.start("components_index") if Instrumentation.hooks else None
+            index = ComponentsIndex(graph)
+            self.components_cache = index
+            if stats is not None:
+                stats.counters["nodes"], stats.counters["components"] = len(index.component_of), len(index.components)
+                stats.finish()
+        return index.component_of, index.components
+
+    def current_components(self, graph: GraphInterface = None):
+        """
+        :param graph: the graph, the graph of this object by default
+        :return: the cached ComponentsIndex if it matches the current mc of the graph, None o.w.
+        """
+        if graph is None:
+            graph = self.get_graph()
+        index = self.components_cache
+        if index is not None and index.graph is graph and index.mc == graph.get_mc():
+            return index
+        return None
+
+    def add_node(self, node_id: int, pos: tuple = None) -> bool:
+        """
+        Adds a node to the graph, and keeps the cached SCCs up to date instead of invalidating them.
+        @param node_id: The node ID
+        @param pos: The position of the node
+        @return: True if the node was added successfully, False o.w.
+        """
+        graph = self.get_graph()
+        if graph is None:
+            return False
+        index = self.current_components(graph)
+        if not graph.add_node(node_id, pos):
+            return False
+        if index is not None:
+            index.add_node(node_id)
+            index.mc = graph.get_mc()
+        return True
+
+    def add_edge(self, id1: int, id2: int, weight: float) -> bool:
+        """
+        Adds an edge to the graph, and keeps the cached SCCs up to date instead of invalidating them.
+        SCCs are merged only if the edge closes a cycle (see ComponentsIndex.add_edge)
+        @param id1: The start node of the edge
+        @param id2: The end node of the edge
+        @param weight: The weight of the edge
+        @return: True if the edge was added successfully, False o.w.
+        """
+        graph = self.get_graph()
+        if graph is None:
+            return False
+        index = self.current_components(graph)
+        if not graph.add_edge(id1, id2, weight):
+            return False
+        if index is not None:
+            index.add_edge(id1, id2)
+            index.mc = graph.get_mc()
+        return True
+
+    def remove_edge(self, node_id1: int, node_id2: int) -> bool:
+        """
+        Removes an edge from the graph, and keeps the cached SCCs up to date instead of invalidating them.
+        Only the SCC that contained the edge is searched again
+        @param node_id1: The start node of the edge
+        @param node_id2: The end node of the edge
+        @return: True if the edge was removed successfully, False o.w.
+        """
+        graph = self.get_graph()
+        if graph is None:
+            return False
+        index = self.current_components(graph)
+        if not graph.remove_edge(node_id1, node_id2):
+            return False
+        if index is not None:
+            index.remove_edge(node_id1, node_id2)
+            index.mc = graph.get_mc()
+        return True
+
+    def remove_node(self, node_id: int) -> bool:
+        """
+        Removes a node from the graph, and keeps the cached SCCs up to date instead of invalidating them.
+        Only the SCC that contained the node is searched again
+        @param node_id: The node ID
+        @return: True if the node was removed successfully, False o.w.
+        """
+        return self.remove_nodes([node_id]) == 1
+
+    def remove_nodes(self, node_ids) -> int:
+        """
+        Removes many nodes from the graph (see DiGraph.remove_nodes),
+        and keeps the cached SCCs up to date instead of invalidating them.
+        Every SCC that lost nodes is searched again once
+        @param node_ids: iterable of node ids
+        @return: The number of nodes that were removed
+        """
+        graph = self.get_graph()
+        if graph is None:
+            return 0
+        index = self.current_components(graph)
+        node_ids = [node_id for node_id in node_ids if node_id in graph.get_all_v()]
+        if hasattr(graph, "remove_nodes"):
+            removed = graph.remove_nodes(node_ids)
+        else:
+            removed = sum(1 for node_id in node_ids if graph.remove_node(node_id))
+        if removed > 0 and index is not None:
+            index.remove_nodes(dict.fromkeys(node_ids))
+            index.mc = graph.get_mc()
+        return removed
 
     def plot_graph(self) -> None:
         """
         Plots the graph.
         If the nodes have a position, the nodes will be placed there.
         Otherwise, they will be placed in a random but elegant manner.
+        The graph is read only through get_pos and all_out_edges_of_node, the random positions are not stored in it
         @return: None
         """
-        if self.get_graph() is not None:
-            nodes_list = self.get_graph().get_all_v()
+        from matplotlib import pyplot as plt
+        graph = self.get_graph()
+        if graph is not None:
+            positions = {node_id: graph.get_pos(node_id) for node_id in graph.get_all_v()}
             no_positions = self.get_empty_pos_nodes()
-            self.generate_positions(no_positions)
-            dx = self.get_differentialx(nodes_list)
+            self.generate_positions(no_positions, positions)
+            dx = self.get_differentialx(positions)
             extend_x = (dx[0] - dx[1]) / 10
-            dy = self.get_differentialy(nodes_list)
+            dy = self.get_differentialy(positions)
             extend_y = (dy[0] - dy[1]) / 10
             plt.axis([dx[0] - extend_x * 12, dx[1] + extend_x * 12, dy[0] - extend_y * 12, dy[1] + extend_y * 12])
 
-            for node_id in nodes_list:
-                node = nodes_list.get(node_id)
-                pos = node.pos
+            for node_id in positions:
+                pos = positions.get(node_id)
 
                 plt.plot(pos[0], pos[1], 'bo')
-                plt.annotate(text=f"{node.key}", xy=(pos[0] + 0.0002, pos[1] + 0.0002),
+                plt.annotate(text=f"{node_id}", xy=(pos[0] + 0.0002, pos[1] + 0.0002),
                              xytext=(pos[0] - 0.0002, pos[1] + 0.0002), color='darkcyan')
 
-            for node_id in nodes_list:
-                node = nodes_list.get(node_id)
-                pos = node.pos
+            for node_id in positions:
+                pos = positions.get(node_id)
 
-                for neighbor_id in node.out_edges:
-                    neighbor = nodes_list.get(neighbor_id)
-                    neigh_pos = neighbor.pos
+                for neighbor_id in graph.all_out_edges_of_node(node_id):
+                    neigh_pos = positions.get(neighbor_id)
                     distance = self.distance(pos,neigh_pos)
                     length = min([distance/10,0.001])
-                    plt.annotate("", xy=(neigh_pos[0], neigh_pos[1]), xytext=(node.pos[0], node.pos[1]),
+                    plt.annotate("", xy=(neigh_pos[0], neigh_pos[1]), xytext=(pos[0], pos[1]),
                                  arrowprops=dict(edgecolor='green', facecolor='black', arrowstyle='-|>'))
 
             plt.show()
 
-    def dijkstra_algorithm(self, source):
+    def dijkstra_algorithm(self, source: int, target: int = None, graph: GraphInterface = None, targets: set = None):
         """
-        dijksra's algorithm implementation
-        :param source: node to start the traversal from
-        :return: dictionary of predecessors of each node
+        dijksra's algorithm implementation on a binary heap of (distance, id) pairs.
+        outdated heap entries are skipped when popped instead of being removed (lazy deletion)
+        :param source: id of the node to start the traversal from
+        :param target: if given, the traversal stops as soon as this node is settled
+        :param graph: the graph to traverse, the graph of this object by default
+        :param targets: if given, the traversal stops as soon as all of these nodes are settled
+        :return: dictionary of distances of each reached node, dictionary of predecessors of each node
+        a CompactGraph is traversed on its CSR arrays (see CompactGraph.dijkstra), and only the settled nodes are
+        returned
         """
-        visited = {}
+        if graph is None:
+            graph = self.get_graph()
+        if isinstance(graph, CompactGraph) and targets is None:
+            keys = graph.keys
+            distances, predecessors, order = graph.dijkstra(graph.index_of[source],
+                                                            target=-1 if target is None else graph.index_of[target])
+            return ({keys[index]: distances[index] for index in order},
+                    {keys[index]: keys[predecessors[index]] for index in order[1:]})
+        out_edges_of = graph.all_out_edges_of_node
+        push, pop = heapq.heappush, heapq.heappop
+        stats = Instrumentation.start("dijkstra") if Instrumentation.hooks else None
+        if stats is not None:
+            out_edges_of = stats.counted_items(out_edges_of, "edges_relaxed")
+            push, pop = stats.counted(push, "heap_pushes"), stats.counted(pop, "heap_pops")
+        remaining = None if targets is None else set(targets)
+        settled = set()
+        distances = {source: 0}
         predecessors = {}
-        nodes_queue = queue.PriorityQueue()
-        for node in self.get_graph().get_all_v().values():
-            node1 = NodeInfo(node)
-            node.set_weight(-1)
-            visited[node.key] = False
-        source.set_weight(0)
-        nodes_queue.put(source)
-        while not nodes_queue.empty():
-            current_node = nodes_queue.get()
-            if visited.get(current_node.key) is False:
-                for node_id in current_node.out_edges.keys():
-                    node = self.get_graph().get_all_v().get(node_id)
-                    distance = current_node.out_edges.get(node_id) + current_node.weight
-                    if node.weight == -1 or distance < node.weight:
-                        node.set_weight(distance)
-                        predecessors[node.key] = current_node
-                        nodes_queue.put(node)
-
-            visited[current_node.key] = True
-
-        return predecessors
-
-    def bfs_twice(self, id: int, total, specific, reverse):
-        """
-        help method for the connected components
+        nodes_heap = [(0, source)]
+        while nodes_heap:
+            current_distance, current_id = pop(nodes_heap)
+            if current_id in settled:
+                continue
+            settled.add(current_id)
+            if current_id == target:
+                break
+            if remaining is not None:
+                remaining.discard(current_id)
+                if not remaining:
+                    break
+            for node_id, weight in out_edges_of(current_id).items():
+                distance = current_distance + weight
+                if node_id not in distances or distance < distances[node_id]:
+                    distances[node_id] = distance
+                    predecessors[node_id] = current_id
+                    push(nodes_heap, (distance, node_id))
+
+        if stats is not None:
+            stats.counters["nodes_settled"] += len(settled)
+            stats.finish()
+        return distances, predecessors
+
+    def compact_path(self, graph: CompactGraph, source: int, target: int) -> (float, list):
+        """
+        shortest path on the CSR arrays of a CompactGraph, without building dictionaries of the reached nodes
+        :param graph: the CompactGraph
+        :param source: id of the start node
+        :param target: id of the end node
+        :return: the distance of the path, list of the nodes ids in the path ((inf, []) if there is no path)
+        """
+        source, target = graph.index_of[source], graph.index_of[target]
+        distances, predecessors, order = graph.dijkstra(source, target=target)
+        if math.isinf(distances[target]):
+            return float('inf'), []
+        path = [target]
+        while path[-1] != source:
+            path.append(predecessors[path[-1]])
+        path.reverse()
+        return distances[target], [graph.keys[index] for index in path]
+
+    def a_star(self, source: int, target: int, graph: GraphInterface = None):
+        """
+        A* algorithm with the heuristic heuristic_scale * (euclidean distance to the target).
+        if heuristic_scale is None the largest scale that keeps the heuristic admissible is used (see admissible_scale).
+        if some node has no position the bound of a path through it is unknown, so dijkstra's algorithm is used
+        :param source: id of the node to start the traversal from
+        :param target: id of the node to reach
+        :param graph: the graph to traverse, the graph of this object by default
+        :return: dictionary of distances of each reached node, dictionary of predecessors of each node
+        """
+        if graph is None:
+            graph = self.get_graph()
+        admissible, positioned = self.heuristic_bounds(graph)
+        scale = admissible if self.heuristic_scale is None else self.heuristic_scale
+        target_pos = graph.get_pos(target)
+        if scale <= 0 or not positioned:
+            return self.dijkstra_algorithm(source, target, graph)
+        out_edges_of, get_pos, distance_of = graph.all_out_edges_of_node, graph.get_pos, self.distance
+        push, pop = heapq.heappush, heapq.heappop
+        stats = Instrumentation.start("a_star") if Instrumentation.hooks else None
+        if stats is not None:
+            out_edges_of = stats.counted_items(out_edges_of, "edges_relaxed")
+            push, pop = stats.counted(push, "heap_pushes"), stats.counted(pop, "heap_pops")
+        settled = set()
+        distances = {source: 0}
+        predecessors = {}
+        nodes_heap = [(scale * distance_of(get_pos(source), target_pos), 0, source)]
+        while nodes_heap:
+            estimate, current_distance, current_id = pop(nodes_heap)
+            if current_id in settled:
+                continue
+            settled.add(current_id)
+            if current_id == target:
+                break
+            for node_id, weight in out_edges_of(current_id).items():
+                distance = current_distance + weight
+                if node_id not in distances or distance < distances[node_id]:
+                    distances[node_id] = distance
+                    predecessors[node_id] = current_id
+                    push(nodes_heap, (distance + scale * distance_of(get_pos(node_id), target_pos), distance, node_id))
+
+        if stats is not None:
+            stats.counters["nodes_settled"] += len(settled)
+            stats.finish()
+        return distances, predecessors
+
+    def admissible_scale(self, graph: GraphInterface = None) -> float:
+        """
+        the largest scale such that scale * (euclidean distance) never exceeds the weight of an edge,
+        with it the A* heuristic is admissible and consistent. cached until the mc of the graph changes
+        :param graph: the graph, the graph of this object by default
+        :return: the scale, 0 if some node has no position
+        """
+        return self.heuristic_bounds(graph)[0]
+
+    def heuristic_bounds(self, graph: GraphInterface = None) -> (float, bool):
+        """
+        :param graph: the graph, the graph of this object by default
+        :return: the admissible scale (see admissible_scale), True if every node has a position.
+        both are cached until the mc of the graph changes
+        """
+        if graph is None:
+            graph = self.get_graph()
+        cached_graph, cached_mc, scale, positioned = self.scale_cache
+        if cached_graph is graph and cached_mc == graph.get_mc():
+            return scale, positioned
+        mc = graph.get_mc()
+        scale = math.inf
+        positioned = True
+        for node_id in graph.get_all_v():
+            pos = graph.get_pos(node_id)
+            if pos is None:
+                scale = 0
+                positioned = False
+                break
+            for neighbor_id, weight in graph.all_out_edges_of_node(node_id).items():
+                neighbor_pos = graph.get_pos(neighbor_id)
+                if neighbor_pos is None:
+                    continue
+                length = self.distance(pos, neighbor_pos)
+                if length > 0 and weight / length < scale:
+                    scale = weight / length
+        if scale == math.inf:
+            scale = 0
+        self.scale_cache = (graph, mc, scale, positioned)
+        return scale, positioned
+
+    def bidirectional_dijkstra(self, source: int, target: int, graph: GraphInterface = None) -> (float, list):
+        """
+        bidirectional dijkstra's algorithm: a forward search on the out edges from the source and a backward
+        search on the in edges from the target, always advancing the side with the smaller heap top.
+        best holds the shortest source->target path seen through an edge between the two searches,
+        and the search stops once the two heap tops together can not beat it
+        :param source: id of the start node
+        :param target: id of the end node
+        :param graph: the graph to traverse, the graph of this object by default
+        :return: the distance of the path, list of the nodes ids in the path ((inf, []) if there is no path)
+        """
+        if graph is None:
+            graph = self.get_graph()
+        edges_of = (graph.all_out_edges_of_node, graph.all_in_edges_of_node)
+        push, pop = heapq.heappush, heapq.heappop
+        stats = Instrumentation.start("bidirectional_dijkstra") if Instrumentation.hooks else None
+        if stats is not None:
+            edges_of = tuple(stats.counted_items(function, "edges_relaxed") for function in edges_of)
+            push, pop = stats.counted(push, "heap_pushes"), stats.counted(pop, "heap_pops")
+        distances = ({source: 0}, {target: 0})
+        predecessors = ({}, {})
+        settled = (set(), set())
+        heaps = ([(0, source)], [(0, target)])
+        best, meeting = float('inf'), None
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            current_distance, current_id = pop(heaps[side])
+            if current_id in settled[side]:
+                continue
+            settled[side].add(current_id)
+            side_distances, other_distances = distances[side], distances[1 - side]
+            for node_id, weight in edges_of[side](current_id).items():
+                distance = current_distance + weight
+                if node_id not in side_distances or distance < side_distances[node_id]:
+                    side_distances[node_id] = distance
+                    predecessors[side][node_id] = current_id
+                    push(heaps[side], (distance, node_id))
+                if node_id in other_distances and side_distances[node_id] + other_distances[node_id] < best:
+                    best = side_distances[node_id] + other_distances[node_id]
+                    meeting = node_id
+        if stats is not None:
+            stats.counters["nodes_settled"] += len(settled[0]) + len(settled[1])
+            stats.finish()
+        if meeting is None:
+            return float('inf'), []
+        path = [meeting]
+        while path[-1] != source:
+            path.append(predecessors[0].get(path[-1]))
+        path.reverse()
+        while path[-1] != target:
+            path.append(predecessors[1].get(path[-1]))
+        return best, path
+
+    def tarjan_components(self, graph: GraphInterface = None) -> dict:
+        """
+        iterative Tarjan's algorithm (see ComponentsIndex.tarjan)
+        :param graph: the graph to traverse, the graph of this object by default
+        :return: dictionary of the SCC number of every node
+        """
+        if graph is None:
+            graph = self.get_graph()
+        if isinstance(graph, CompactGraph):
+            return dict(zip(graph.keys, graph.tarjan()))
+        return ComponentsIndex.tarjan(graph.get_all_v(), graph.all_out_edges_of_node)
+
+    def bfs_twice(self, id: int, total, specific):
+        """
+        help method for the connected components: a BFS on the out edges and a BFS on the in edges
+        (see Reachability.component)
         :param id: node which the algorithm will find its SCC
         :param total: dictionary of nodes. if an SCC found for a node it will be on the dict
         :param specific: pointer for the list of the SCC
-        :param reverse: transposed version of this graph
         :return: list
         """
-        q = queue.Queue()
-        nodes_list = self.get_graph().get_all_v()
-        start = self.get_graph().get_all_v().get(id)
-        saved_nodes, visited = {}, {}
-        q.put(start)
-        specific.append(start.get_key())
-        while not q.empty():
-            node = q.get()
-            for neighbor_id in node.out_edges:
-                neighbor = nodes_list.get(neighbor_id)
-                if neighbor_id not in visited:
-                    visited[neighbor_id] = True
-                    saved_nodes[neighbor.get_key()] = True
-                    q.put(neighbor)
-        nodes_list = reverse.get_all_v()
-        start = nodes_list.get(id)
-        q.put(start)
-        visited.clear()
-        while not q.empty():
-            node = q.get()
-            for neighbor_id in node.out_edges:
-                neighbor = nodes_list.get(neighbor_id)
-                if neighbor_id not in visited:
-                    visited[neighbor_id] = True
-                    q.put(neighbor)
-                    if saved_nodes.get(neighbor_id) is True:
-                        total[neighbor_id] = True
-                        specific.append(neighbor_id)
-        specific = list(dict.fromkeys(specific))
+        stats = Instrumentation.start("bfs_twice") if Instrumentation.hooks else None
+        engine = self.reachability()
+        keys = engine.compact.keys
+        order = engine.component(engine.compact.index_of[id])
+        specific.append(id)
+        specific.extend(keys[index] for index in order[1:])
+        if len(order) > 1:
+            total.update(dict.fromkeys(specific[-len(order):], True))
+        if stats is not None:
+            stats.counters["component_size"] += len(order)
+            stats.finish()
         return specific
 
-    def reversed_graph(self):
+    def reversed_graph(self) -> GraphInterface:
         """
-
-        :return: transposed version of the graph
+        :return: transposed version of the graph, without copying it: a ReversedGraph view over the in and out edges
+        dictionaries of the graph, or for a CompactGraph the CompactGraph over its reverse arrays
+        (None if there is no graph)
         """
         graph = self.get_graph()
-        reveresed = Graph()
-        for node_id in graph.get_all_v():
-            node = self.get_graph().get_all_v().get(node_id)
-            if node.pos is not None:
-                reveresed.add_node(node.get_key(), node.pos)
-            else:
-                reveresed.add_node(node.get_key())
-        for node_id in graph.get_all_v():
-            node = self.get_graph().get_all_v().get(node_id)
-            for key in node.out_edges.keys():
-                reveresed.add_edge(key, node.get_key(), 0)
-        return reveresed
+        if graph is None:
+            return None
+        if isinstance(graph, CompactGraph):
+            return graph.transpose()
+        return ReversedGraph(graph)
 
     def get_empty_pos_nodes(self):
         """
 
-        :return: list of nodes with no positions
+        :return: list of the ids of the nodes with no positions
         """
         ans = []
-        nodes_list = self.get_graph().get_all_v()
-        for node_id in nodes_list:
-            node = nodes_list.get(node_id)
-            if node.pos is None:
-                ans.append(node)
+        graph = self.get_graph()
+        for node_id in graph.get_all_v():
+            if graph.get_pos(node_id) is None:
+                ans.append(node_id)
         return ans
 
-    def generate_positions(self, nodes: []):
+    def generate_positions(self, nodes: [], positions: dict):
         """
         generate random positions for the nodes
-        :param nodes:
+        :param nodes: ids of the nodes to place
+        :param positions: dictionary of the position of every node id (None for no position), updated in place
         :return:
         """
         x_min = 35.19
@@ -291,19 +1226,19 @@ class GraphAlgo(GraphAlgoInterface):
         y_min = 31.1
         y_max = 31.2
         amount = 1 if len(nodes) == 0 else len(nodes)
-        dx = self.get_differentialx(self.get_graph().get_all_v())
-        dy = self.get_differentialy(self.get_graph().get_all_v())
+        dx = self.get_differentialx(positions)
+        dy = self.get_differentialy(positions)
         if dx != (-math.inf,math.inf) and dy != (-math.inf,math.inf):
             x_max ,x_min =dx[0],dx[1]
             y_max,y_min = dy[0],dy[1]
 
 
         counter = 0
-        for node in nodes:
+        for node_id in nodes:
             x_point = rand.uniform(x_min, x_max)
             y_point = rand.uniform(y_min, y_max)
 
-            node.pos = (x_point, y_point, 0)
+            positions[node_id] = (x_point, y_point, 0)
             counter += 1
 
     def get_differentialx(self, dict):
@@ -311,9 +1246,9 @@ class GraphAlgo(GraphAlgoInterface):
         min = math.inf
 
         for node_key in dict.keys():
-            node = dict.get(node_key)
-            if node.pos is not None:
-                x = node.pos[0]
+            pos = dict.get(node_key)
+            if pos is not None:
+                x = pos[0]
                 if max < x:
                     max = x
                 if min > x:
@@ -324,9 +1259,9 @@ class GraphAlgo(GraphAlgoInterface):
         max = -math.inf
         min = math.inf
         for node_key in dict.keys():
-            node = dict.get(node_key)
-            if node.pos is not None:
-                y = node.pos[1]
+            pos = dict.get(node_key)
+            if pos is not None:
+                y = pos[1]
                 if max < y:
                     max = y
                 if min > y:
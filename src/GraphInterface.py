@@ -29,6 +29,14 @@ class GraphInterface:
         weight)
         """
 
+    def get_pos(self, id1: int) -> tuple:
+        """
+        Returns the position of a node
+        @param id1: The node id
+        @return: the (x, y, z) position of the node, None if it has no position
+        """
+        raise NotImplementedError
+
     def get_mc(self) -> int:
         """
         Returns the current version of this graph,
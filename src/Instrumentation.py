@@ -0,0 +1,118 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+hooks = []
+
+
+class QueryStats:
+    """This class represents the counters and the phase timings of one instrumented call.
+    The hot paths only build it while a hook is registered, so without hooks the instrumentation costs one
+    check per call and nothing inside the loops."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counters = Counter()
+        self.timings = {}
+        self.seconds = 0.0
+        self.start = time.perf_counter()
+
+    def counted(self, function, counter: str):
+        """
+        :param function: the function to count the calls of (heappush, heappop...)
+        :param counter: name of the counter
+        :return: function that calls the given one and adds 1 to the counter
+        """
+        counters = self.counters
+
+        def call(*arguments):
+            counters[counter] += 1
+            return function(*arguments)
+        return call
+
+    def counted_items(self, function, counter: str):
+        """
+        :param function: function that returns a collection (all_out_edges_of_node...)
+        :param counter: name of the counter
+        :return: function that calls the given one and adds the size of its result to the counter
+        """
+        counters = self.counters
+
+        def call(*arguments):
+            items = function(*arguments)
+            counters[counter] += len(items)
+            return items
+        return call
+
+    def timed(self, function, phase: str):
+        """
+        :param function: the function to time
+        :param phase: name of the phase the calls are added to
+        :return: function that calls the given one and adds the time of the call to the phase
+        """
+        timings = self.timings
+
+        def call(*arguments):
+            start = time.perf_counter()
+            try:
+                return function(*arguments)
+            finally:
+                timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - start
+        return call
+
+    def finish(self) -> None:
+        """
+        sets the total time of the call and passes the stats to every hook
+        :return: None
+        """
+        self.seconds = time.perf_counter() - self.start
+        for hook in list(hooks):
+            hook(self)
+
+    def as_dict(self) -> dict:
+        return {"name": self.name, "seconds": self.seconds, "counters": dict(self.counters),
+                "timings": dict(self.timings)}
+
+    def __repr__(self):
+        return f"QueryStats {self.name}: {self.seconds:.6f}s {dict(self.counters)} {self.timings}"
+
+
+def start(name: str) -> QueryStats:
+    """
+    :param name: name of the instrumented call
+    :return: new stats of the call, the call site creates them only if hooks is not empty
+    """
+    return QueryStats(name)
+
+
+def add_hook(hook) -> None:
+    """
+    registers a function that receives the QueryStats of every instrumented call (in the calling thread).
+    the calls are instrumented only while at least one hook is registered
+    :param hook: function of one QueryStats argument
+    :return: None
+    """
+    hooks.append(hook)
+
+
+def remove_hook(hook) -> None:
+    """
+    :param hook: a registered hook
+    :return: None
+    """
+    if hook in hooks:
+        hooks.remove(hook)
+
+
+@contextmanager
+def recording():
+    """
+    collects the stats of the instrumented calls made inside the with block
+    :return: context manager of the list that the stats are appended to
+    """
+    records = []
+    add_hook(records.append)
+    try:
+        yield records
+    finally:
+        remove_hook(records.append)
@@ -0,0 +1,105 @@
+import json
+
+NUMBER_CHARS = ".eE+-0123456789"
+
+
+class JsonGraphReader:
+    """This class reads a graph json file ({"Edges": [...], "Nodes": [...]}) one record at a time,
+    so only a small window of the file is held in memory instead of the whole parsed document."""
+
+    def __init__(self, file, chunk_size: int = 1 << 16):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def records(self):
+        """
+        generator of the elements of the top level arrays
+        :return: yields (key, element) pairs, for example ("Nodes", {"pos": "1,2,0", "id": 0})
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            return
+        while True:
+            key = self.decode()
+            self.expect(":")
+            if self.peek() == "[":
+                self.expect("[")
+                if self.peek() == "]":
+                    self.expect("]")
+                else:
+                    while True:
+                        yield key, self.decode()
+                        if self.next_char() == "]":
+                            break
+                        self.position -= 1
+                        self.expect(",")
+            else:
+                self.decode()
+            if self.next_char() == "}":
+                return
+            self.position -= 1
+            self.expect(",")
+
+    def fill(self) -> bool:
+        """
+        reads the next chunk of the file into the buffer, dropping the part that was already parsed
+        :return: False if the file has ended, True o.w.
+        """
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        :return: the next non whitespace character, without consuming it ("" at the end of the file)
+        """
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in " \t\n\r":
+                self.position += 1
+            if self.position < len(self.buffer) or not self.fill():
+                return self.buffer[self.position:self.position + 1]
+
+    def next_char(self) -> str:
+        """
+        :return: the next non whitespace character
+        """
+        char = self.peek()
+        if char == "":
+            raise ValueError("unexpected end of the json file")
+        self.position += 1
+        return char
+
+    def expect(self, char: str) -> None:
+        found = self.next_char()
+        if found != char:
+            raise ValueError(f"expected '{char}' but found '{found}' in the json file")
+
+    def decode(self):
+        """
+        decodes the next json value, reading more chunks until the buffer holds all of it.
+        a number is complete only if a character that can not continue it follows, "1.5e3" split after "1" decodes
+        as 1 otherwise
+        :return: the decoded value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                number = isinstance(value, (int, float)) and not isinstance(value, bool)
+                if self.eof or end < len(self.buffer) and not (number and self.buffer[end] in NUMBER_CHARS):
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
@@ -0,0 +1,80 @@
+import json
+from GraphInterface import GraphInterface
+
+
+class JsonGraphWriter:
+    """This class writes a graph in the json format ({"Edges": [...], "Nodes": [...]}) one record at a time,
+    so the whole document is never built in memory. The pretty layout is the same as json.dump(indent=4)."""
+
+    def __init__(self, file, compact: bool = False):
+        self.file = file
+        self.compact = compact
+        self.encode = json.JSONEncoder().encode
+
+    def write(self, graph: GraphInterface) -> None:
+        """
+        writes the edges and the nodes of a graph
+        :param graph: the graph to write
+        :return: None
+        """
+        self.file.write("{" if self.compact else "{\n")
+        self.write_array("Edges", self.edges(graph))
+        self.file.write("," if self.compact else ",\n")
+        self.write_array("Nodes", self.nodes(graph))
+        self.file.write("}" if self.compact else "\n}")
+
+    def write_array(self, key: str, records) -> None:
+        """
+        writes "key": [records...]
+        :param key: the key of the array
+        :param records: iterable of the dictionaries to write, with plain string keys and scalar values
+        :return: None
+        """
+        if self.compact:
+            self.file.write(f'"{key}":[')
+            separator = ""
+            for record in records:
+                self.file.write(separator + json.dumps(record, separators=(",", ":")))
+                separator = ","
+            self.file.write("]")
+        else:
+            self.file.write(f'    "{key}": [')
+            separator = "\n        "
+            for record in records:
+                self.file.write(separator + "{\n            " + ",\n            ".join(
+                    [f'"{name}": {self.encode_value(value)}' for name, value in record.items()]) + "\n        }")
+                separator = ",\n        "
+            self.file.write("]" if separator == "\n        " else "\n    ]")
+
+    def encode_value(self, value) -> str:
+        """
+        the json text of a scalar value of a record, ints and finite floats are formatted directly and the other
+        values go through the json encoder
+        :param value: int, float, string, bool or None
+        :return: the value as json.dumps writes it
+        """
+        kind = type(value)
+        if kind is int:
+            return int.__repr__(value)
+        if kind is float and value - value == 0:
+            return float.__repr__(value)
+        return self.encode(value)
+
+    def edges(self, graph: GraphInterface):
+        """
+        :param graph: the graph
+        :return: generator of the edges records of the graph
+        """
+        for key in graph.get_all_v():
+            for dst, weight in graph.all_out_edges_of_node(key).items():
+                yield {"src": key, "w": weight, "dest": dst}
+
+    def nodes(self, graph: GraphInterface):
+        """
+        :param graph: the graph
+        :return: generator of the nodes records of the graph
+        """
+        for key in graph.get_all_v():
+            pos = graph.get_pos(key)
+            encoded_pos = None if pos is None else str(pos[0]) + "," + str(pos[1]) + "," + str(pos[2])
+            yield {"pos": encoded_pos, "id": key}
@@ -1,12 +1,20 @@
+from types import MappingProxyType
+
+EMPTY_EDGES = MappingProxyType({})
+
+
 class NodeInfo:
-    """This class represents a single node in a directed weighted graph"""
+    """This class represents a single node in a directed weighted graph.
+    The edges dictionaries of a node without edges are the shared read only EMPTY_EDGES,
+    a real dictionary is allocated by the first edge added in that direction.
+    EMPTY_EDGES stays inside the graph: DiGraph returns a new empty dict for it."""
+
+    __slots__ = ("key", "pos", "in_edges", "out_edges")
 
-    def __init__(self, key: int, pos: tuple = None, weight: float = -1):
+    def __init__(self, key: int, pos: tuple = None):
         self.key = key
-        self.in_edges = {}
-        self.out_edges = {}
-        self.weight = weight
-        self.tag = (-1, -1)
+        self.in_edges = EMPTY_EDGES
+        self.out_edges = EMPTY_EDGES
         self.pos = pos
 
     def get_key(self) -> int:
@@ -24,6 +32,8 @@ class NodeInfo:
         :param weight: weight of the edge
         :return:None
         """
+        if self.in_edges is EMPTY_EDGES:
+            self.in_edges = {}
         self.in_edges[source_id] = weight
 
     def add_out_edge(self, dest_id: int, weight: float = 0):
@@ -33,6 +43,8 @@ class NodeInfo:
         :param weight: weight of the edge
         :return:None
         """
+        if self.out_edges is EMPTY_EDGES:
+            self.out_edges = {}
         self.out_edges[dest_id] = weight
 
     def remove_in_edge(self, source_id: int) -> None:
@@ -41,26 +53,17 @@ class NodeInfo:
         :param source_id: source of the edge
         :return: None
         """
-        self.in_edges.pop(source_id, None)
+        if source_id in self.in_edges:
+            self.in_edges.pop(source_id)
 
     def remove_out_edge(self, dest_id: int):
         """
-        remove an edge going into the node
-        :param source_id: source of the edge
-        :return: None
-        """
-        self.in_edges.pop(dest_id, None)
-
-    def set_weight(self, weight: float) -> None:
-        """
-        update the weight of the node
-        :param weight: weight of the node
+        remove an edge going out of the node
+        :param dest_id: destination of the edge
         :return: None
         """
-        self.weight = weight
-
-    def __lt__(self, other):
-        return self.weight < other.weight
+        if dest_id in self.out_edges:
+            self.out_edges.pop(dest_id)
 
     def encoder(self):
         ans = {}
@@ -78,6 +81,17 @@ class NodeInfo:
             return False
         if self.pos != other.pos:
             return False
-        return self.out_edges.__eq__(other.out_edges) and self.in_edges.__eq__(other.in_edges)
+        return self.out_edges == other.out_edges and self.in_edges == other.in_edges
+
+    def __getstate__(self):
+        in_edges = None if self.in_edges is EMPTY_EDGES else self.in_edges
+        out_edges = None if self.out_edges is EMPTY_EDGES else self.out_edges
+        return self.key, self.pos, in_edges, out_edges
+
+    def __setstate__(self, state):
+        self.key, self.pos, in_edges, out_edges = state
+        self.in_edges = in_edges if in_edges else EMPTY_EDGES
+        self.out_edges = out_edges if out_edges else EMPTY_EDGES
+
     def __repr__(self):
         return f"{self.key}: |edges out|: {len(self.out_edges)} |edges in|: {len(self.in_edges)}"
\ No newline at end of file
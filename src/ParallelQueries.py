@@ -0,0 +1,78 @@
+import multiprocessing
+import os
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+worker_algo = None
+
+
+def init_worker(algo_class, graph) -> None:
+    """
+    runs once in every worker process, the graph is inherited from the parent when the pool forks
+    :param algo_class: the class of the algorithms object to build in the worker
+    :param graph: the graph to work on
+    :return: None
+    """
+    global worker_algo
+    worker_algo = algo_class(graph)
+
+
+def call_worker(call: tuple):
+    """
+    :param call: (method name, arguments tuple)
+    :return: the result of the method of the worker's algorithms object
+    """
+    name, arguments = call
+    return getattr(worker_algo, name)(*arguments)
+
+
+def workers_count(workers: int) -> int:
+    """
+    :param workers: number of processes, None for every cpu
+    :return: the number of processes
+    """
+    return (os.cpu_count() or 1) if workers is None else workers
+
+
+@contextmanager
+def pool(algo, workers: int = 1):
+    """
+    a process pool that can run several batches of calls (see run) without starting new processes.
+    the pool uses fork where it is available, so the workers share the loaded graph with the parent
+    instead of receiving a copy of it
+    :param algo: the algorithms object (GraphAlgo)
+    :param workers: number of processes, 1 gives None (run calls everything in this process) and None uses every cpu
+    :return: context manager of the ProcessPoolExecutor, or of None
+    """
+    workers = workers_count(workers)
+    if workers <= 1:
+        yield None
+        return
+    context = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=init_worker,
+                             initargs=(type(algo), algo.get_graph())) as executor:
+        yield executor
+
+
+def run(algo, name: str, tasks: list, workers: int = 1, executor: ProcessPoolExecutor = None) -> list:
+    """
+    calls a method of an algorithms object once per task, in this process or spread on a process pool
+    :param algo: the algorithms object (GraphAlgo)
+    :param name: name of the method to call
+    :param tasks: list of arguments tuples, one per call
+    :param workers: number of processes, 1 runs everything in this process and None uses every cpu
+    :param executor: a pool opened with pool(algo, workers) to run on, by default a pool is opened for this call
+    :return: list of the results, in the order of the tasks
+    """
+    workers = workers_count(workers)
+    if executor is None:
+        workers = min(workers, len(tasks))
+        if workers > 1:
+            with pool(algo, workers) as executor:
+                return run(algo, name, tasks, workers, executor)
+        method = getattr(algo, name)
+        return [method(*arguments) for arguments in tasks]
+    chunk_size = max(1, len(tasks) // (workers * 4))
+    return list(executor.map(call_worker, [(name, arguments) for arguments in tasks], chunksize=chunk_size))
@@ -0,0 +1,104 @@
+import threading
+import Instrumentation
+from array import array
+from CompactGraph import CompactGraph
+
+
+class Reachability:
+    """This class represents breadth first searches over the node indexes of a CompactGraph.
+    A search is level synchronous: the list of the reached nodes is also the queue, and level k is a contiguous
+    range of it. Visited nodes are marked in a per thread array with the number of the search, so nothing has to be
+    cleared or allocated between searches."""
+
+    def __init__(self, compact: CompactGraph):
+        self.compact = compact
+        self.local = threading.local()
+
+    def marks(self, searches: int = 1):
+        """
+        the visited marks of this thread
+        :param searches: how many search numbers to reserve
+        :return: (marks array, the first reserved search number, parents array)
+        """
+        local = self.local
+        if not hasattr(local, "marks"):
+            local.marks = array('q', [0]) * self.compact.v_size()
+            local.parents = array('q', [-1]) * self.compact.v_size()
+            local.search = 0
+        local.search += searches
+        return local.marks, local.search - searches + 1, local.parents
+
+    def search(self, source: int, max_hops: int = None, target: int = -1, reverse: bool = False):
+        """
+        BFS from a node index
+        :param source: index of the node to start from
+        :param max_hops: if given, nodes farther than max_hops edges are not reached
+        :param target: index of a node to stop at once it is reached
+        :param reverse: follow the edges backwards (the nodes that reach the source)
+        :return: list of the reached indexes in BFS order, list of the positions where every level starts,
+        parents array (the parent of every reached index except the source is valid until the next search)
+        """
+        if reverse:
+            offsets, neighbors = self.compact.reverse_arrays()[:2]
+        else:
+            offsets, neighbors = self.compact.offsets, self.compact.neighbors
+        stats = Instrumentation.start("bfs_search") if Instrumentation.hooks else None
+        marks, search, parents = self.marks()
+        marks[source] = search
+        order, starts = [source], [0]
+        try:
+            if source == target:
+                return order, starts, parents
+            start, hops = 0, 0
+            while start < len(order) and (max_hops is None or hops < max_hops):
+                end = len(order)
+                starts.append(end)
+                for position in range(start, end):
+                    node = order[position]
+                    for neighbor in neighbors[offsets[node]:offsets[node + 1]]:
+                        if marks[neighbor] != search:
+                            marks[neighbor] = search
+                            parents[neighbor] = node
+                            order.append(neighbor)
+                            if neighbor == target:
+                                return order, starts, parents
+                start, hops = end, hops + 1
+            if starts[-1] == len(order):
+                starts.pop()
+            return order, starts, parents
+        finally:
+            if stats is not None:
+                stats.counters["bfs_visits"] += len(order)
+                stats.finish()
+
+    def component(self, source: int) -> list:
+        """
+        the SCC of a node: the nodes that the source reaches and that reach it.
+        a path into the source from a node of its SCC only passes through nodes of the SCC, so the backward search
+        only enters nodes that the forward search reached
+        :param source: index of the node
+        :return: list of the indexes of the SCC, the source first and then the others in backward BFS order
+        """
+        in_offsets, in_neighbors = self.compact.reverse_arrays()[:2]
+        offsets, neighbors = self.compact.offsets, self.compact.neighbors
+        stats = Instrumentation.start("bfs_component") if Instrumentation.hooks else None
+        marks, forward, parents = self.marks(2)
+        backward = forward + 1
+        marks[source] = forward
+        pending = [source]
+        for node in pending:
+            for neighbor in neighbors[offsets[node]:offsets[node + 1]]:
+                if marks[neighbor] != forward:
+                    marks[neighbor] = forward
+                    pending.append(neighbor)
+        marks[source] = backward
+        order = [source]
+        for node in order:
+            for neighbor in in_neighbors[in_offsets[node]:in_offsets[node + 1]]:
+                if marks[neighbor] == forward:
+                    marks[neighbor] = backward
+                    order.append(neighbor)
+        if stats is not None:
+            stats.counters["bfs_visits"] += len(pending) + len(order)
+            stats.finish()
+        return order
@@ -0,0 +1,112 @@
+from GraphInterface import GraphInterface
+
+
+class ReversedGraph(GraphInterface):
+    """This class represents the transpose of a graph as a read only view: the out edges of a node are the in edges
+    of the node in the graph and the other way around. Nothing is copied, the view reads the edge dictionaries the
+    graph already keeps in both directions, so it always shows the current state of the graph.
+    Only the edge methods (all_out_edges_of_node, all_in_edges_of_node, has_edge) and as_dict are transposed: the node
+    objects of get_all_v() are the nodes of the graph, and their own edge dictionaries still point forward."""
+
+    def __init__(self, graph: GraphInterface):
+        self.graph = graph
+
+    def v_size(self) -> int:
+        """
+        Returns the number of vertices in this graph
+        @return: The number of vertices in this graph
+        """
+        return self.graph.v_size()
+
+    def e_size(self) -> int:
+        """
+        Returns the number of edges in this graph
+        @return: The number of edges in this graph
+        """
+        return self.graph.e_size()
+
+    def get_all_v(self) -> dict:
+        """return a dictionary of all the nodes in the Graph, each node is represented using a pair (key, node_data)
+        the node_data objects are the ones of the viewed graph, read their edges with all_out_edges_of_node
+        """
+        return self.graph.get_all_v()
+
+    def get_mc(self) -> int:
+        """
+        Returns the mc of the viewed graph
+        @return: The version of this graph.
+        """
+        return self.graph.get_mc()
+
+    def get_pos(self, id1: int) -> tuple:
+        """
+        :param id1: node id
+        :return: the (x, y, z) position of the node, None if it has no position
+        """
+        return self.graph.get_pos(id1)
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        """return a dictionary of all the nodes connected to (into) node_id ,
+        each node is represented using a pair (key, weight)
+         """
+        return self.graph.all_out_edges_of_node(id1)
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        """return a dictionary of all the nodes connected from node_id , each node is represented using a pair (key,
+        weight)
+        """
+        return self.graph.all_in_edges_of_node(id1)
+
+    def has_edge(self, node_id1: int, node_id2: int) -> bool:
+        return self.graph.has_edge(node_id2, node_id1)
+
+    def add_edge(self, id1: int, id2: int, weight: float) -> bool:
+        """
+        The view is read only, the function will do nothing
+        @return: False
+        """
+        return False
+
+    def add_node(self, node_id: int, pos: tuple = None) -> bool:
+        """
+        The view is read only, the function will do nothing
+        @return: False
+        """
+        return False
+
+    def remove_node(self, node_id: int) -> bool:
+        """
+        The view is read only, the function will do nothing
+        @return: False
+        """
+        return False
+
+    def remove_edge(self, node_id1: int, node_id2: int) -> bool:
+        """
+        The view is read only, the function will do nothing
+        @return: False
+        """
+        return False
+
+    def as_dict(self):
+        list_of_nodes = []
+        list_of_edges = []
+        for key in self.get_all_v():
+            pos = self.get_pos(key)
+            encoded_pos = None if pos is None else str(pos[0]) + "," + str(pos[1]) + "," + str(pos[2])
+            list_of_nodes.append({"pos": encoded_pos, "id": key})
+            for dst, weight in self.all_out_edges_of_node(key).items():
+                encoded_edge = {"src": key, "w": weight, "dest": dst}
+                list_of_edges.append(encoded_edge)
+
+        ans = {"Edges": list_of_edges, "Nodes": list_of_nodes}
+        return ans
+
+    def __eq__(self, other):
+        if not isinstance(other, GraphInterface) or self.get_all_v().keys() != other.get_all_v().keys():
+            return False
+        return all(self.get_pos(key) == other.get_pos(key)
+                   and self.all_out_edges_of_node(key) == other.all_out_edges_of_node(key) for key in self.get_all_v())
+
+    def __repr__(self):
+        return "ReversedGraph: |V|=" + str(self.v_size()) + " , |E|=" + str(self.e_size())
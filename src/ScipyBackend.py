@@ -0,0 +1,119 @@
+import importlib.util
+import math
+from CompactGraph import CompactGraph
+
+
+class ScipyBackend:
+    """This class answers the queries of GraphAlgo with scipy.sparse.csgraph, on a sparse matrix that shares the CSR
+    arrays of a CompactGraph. scipy and numpy are optional: available() tells if scipy is installed, and both are
+    imported only when a backend is created or used, so importing GraphAlgo does not need them."""
+
+    def __init__(self, compact: CompactGraph):
+        import numpy as np
+        from scipy.sparse import csr_matrix
+        from scipy.sparse import csgraph
+        size = compact.v_size()
+        self.csgraph = csgraph
+        self.compact = compact
+        self.keys = np.asarray(compact.keys, dtype=np.int64)
+        self.matrix = csr_matrix((np.asarray(compact.weights, dtype=np.float64),
+                                  np.asarray(compact.neighbors, dtype=np.int64),
+                                  np.asarray(compact.offsets, dtype=np.int64)), shape=(size, size))
+        self.labels = None
+
+    @staticmethod
+    def available() -> bool:
+        """
+        :return: True if scipy is installed
+        """
+        return importlib.util.find_spec("scipy") is not None
+
+    def shortest_path(self, id1: int, id2: int) -> (float, list):
+        """
+        :param id1: the start node id (must be in the graph)
+        :param id2: the end node id (must be in the graph)
+        :return: the distance of the shortest path from id1 to id2 and the list of the nodes ids on it,
+        (inf, []) if there is no path
+        """
+        source, target = self.compact.index_of[id1], self.compact.index_of[id2]
+        distances, predecessors = self.csgraph.dijkstra(self.matrix, indices=source, return_predecessors=True)
+        if math.isinf(distances[target]):
+            return float('inf'), []
+        path = [target]
+        while path[-1] != source:
+            path.append(predecessors[path[-1]])
+        return float(distances[target]), [int(self.keys[index]) for index in reversed(path)]
+
+    def connected_components(self) -> list:
+        """
+        :return: list of the nodes ids lists of the SCCs, ordered by their first node in get_all_v() order,
+        with the nodes of every SCC in get_all_v() order
+        """
+        import numpy as np
+        if self.labels is None:
+            self.labels = self.csgraph.connected_components(self.matrix, directed=True, connection="strong")[1]
+        labels = self.labels
+        if len(labels) == 0:
+            return []
+        groups = np.split(self.keys[np.argsort(labels, kind="stable")], np.cumsum(np.bincount(labels))[:-1])
+        firsts = np.unique(labels, return_index=True)[1]
+        return [groups[label].tolist() for label in np.argsort(firsts)]
+
+    def all_pairs_shortest_paths(self):
+        """
+        :return: (keys, distances, next_hops) as GraphAlgo.all_pairs_shortest_paths returns them
+        """
+        import numpy as np
+        size = len(self.keys)
+        distances, predecessors = self.csgraph.shortest_path(self.matrix, return_predecessors=True)
+        rows = np.arange(size)[:, None]
+        # the node after the source on the path to every target: targets whose predecessor is the source are
+        # their own next hop, and the others take the next hop of their predecessor (pointer jumping)
+        next_hops = np.where(predecessors == rows, np.arange(size)[None, :], predecessors).astype(np.int64)
+        next_hops[predecessors < 0] = -1
+        while True:
+            known = next_hops >= 0
+            jumped = next_hops.copy()
+            jumped[known] = next_hops[np.broadcast_to(rows, (size, size))[known], next_hops[known]]
+            if np.array_equal(jumped, next_hops):
+                break
+            next_hops = jumped
+        next_hops[np.arange(size), np.arange(size)] = np.arange(size)
+        return self.keys.tolist(), distances, next_hops
+
+    def check(self, name: str, answer, expected) -> None:
+        """
+        compares an answer of this backend with the answer of the python implementation.
+        paths and component orders may differ where there are ties, so only what must agree is compared
+        :param name: name of the query
+        :param answer: the answer of this backend
+        :param expected: the answer of the python implementation
+        :return: None, raises RuntimeError if the answers disagree
+        """
+        import numpy as np
+        if name == "shortest_path":
+            same = self.same_distance(answer[0], expected[0]) and self.same_distance(self.length(answer[1]),
+                                                                                      answer[0])
+        elif name == "connected_components":
+            same = {frozenset(component) for component in answer} == {frozenset(component) for component in expected}
+        elif name == "all_pairs_shortest_paths":
+            same = answer[0] == expected[0] and np.allclose(answer[1], expected[1], rtol=1e-9, atol=0)
+            same = same and np.array_equal(answer[2] < 0, expected[2] < 0)
+        else:
+            raise ValueError("unknown backend query: " + str(name))
+        if not same:
+            raise RuntimeError("the scipy backend and the python implementation disagree on " + name)
+
+    def length(self, path: list) -> float:
+        """
+        :param path: list of nodes ids
+        :return: the sum of the weights of the edges along the path, inf for an empty path
+        """
+        if len(path) == 0:
+            return float('inf')
+        return sum(self.compact.all_out_edges_of_node(path[position])[path[position + 1]]
+                   for position in range(len(path) - 1))
+
+    @staticmethod
+    def same_distance(distance: float, other: float) -> bool:
+        return distance == other or math.isclose(distance, other, rel_tol=1e-9)
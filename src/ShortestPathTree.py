@@ -0,0 +1,37 @@
+class ShortestPathTree:
+    """This class represents the shortest paths from a single source node to every node it reaches,
+    as computed by dijkstra's algorithm: the distance of every reached node and its predecessor on the path."""
+
+    def __init__(self, source: int, distances: dict, predecessors: dict, mc: int = -1):
+        self.source = source
+        self.distances = distances
+        self.predecessors = predecessors
+        self.mc = mc
+
+    def distance(self, id1: int) -> float:
+        """
+        :param id1: the end node id
+        :return: the distance of the shortest path from the source to id1, inf if id1 is not reached
+        """
+        return self.distances.get(id1, float('inf'))
+
+    def path(self, id1: int) -> (float, list):
+        """
+        Returns the shortest path from the source to node id1
+        @param id1: The end node id
+        @return: The distance of the path, a list of the nodes ids that the path goes through
+        If id1 is not reached the function returns (float('inf'),[])
+        """
+        if id1 not in self.distances:
+            return float('inf'), []
+        path = [id1]
+        while path[-1] != self.source:
+            path.append(self.predecessors.get(path[-1]))
+        path.reverse()
+        return self.distances.get(id1), path
+
+    def __contains__(self, id1: int) -> bool:
+        return id1 in self.distances
+
+    def __repr__(self):
+        return f"ShortestPathTree from {self.source}: |reached|: {len(self.distances)}"
@@ -0,0 +1,40 @@
+import unittest
+import os
+import json
+import tempfile
+import Benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_synthetic_graph(self):
+        graph = Benchmark.synthetic_graph(500, 3, 7)
+        self.assertEqual(500, graph.v_size())
+        self.assertTrue(1400 < graph.e_size() <= 1500)
+        other = Benchmark.synthetic_graph(500, 3, 7)
+        self.assertEqual(graph.as_dict(), other.as_dict())
+
+    def test_bench_graph(self):
+        results = Benchmark.bench_graph(None, os.path.join(Benchmark.DATA_DIR, "A1"), 20, 0, True)
+        self.assertEqual(17, results["nodes"])
+        for operation in ["load_from_json", "save_to_json", "shortest_path", "connected_components"]:
+            self.assertGreater(results[operation]["seconds"], 0)
+            self.assertGreater(results[operation]["peak_bytes"], 0)
+        self.assertEqual(20, results["shortest_path"]["calls"])
+        latency = results["shortest_path"]["latency_ms"]
+        self.assertTrue(latency["p50"] <= latency["p90"] <= latency["p99"] <= latency["max"])
+        results = Benchmark.bench_graph(Benchmark.synthetic_graph(200), None, 5, 0, False)
+        self.assertEqual(200, results["nodes"])
+        self.assertNotIn("peak_bytes", results["save_to_json"])
+
+    def test_main_and_compare(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            self.assertEqual(0, Benchmark.main(["--data", "A0", "--sizes", "100", "--queries", "5", "--no-memory",
+                                                "--output", output]))
+            with open(output) as file:
+                results = json.load(file)
+        self.assertEqual(["A0", "random_100"], list(results["graphs"]))
+        baseline = {"graphs": {"A0": {"shortest_path": {"seconds": 0.5}, "load_from_json": {"seconds": 0.0001}}}}
+        slower = {"graphs": {"A0": {"shortest_path": {"seconds": 1.0}, "load_from_json": {"seconds": 1.0}}}}
+        self.assertEqual(1, len(Benchmark.compare(slower, baseline, 0.2)))
+        self.assertEqual([], Benchmark.compare(baseline, baseline, 0.2))
@@ -0,0 +1,70 @@
+import unittest
+from DiGraph import DiGraph
+from CompactGraph import CompactGraph
+
+
+class TestCompactGraph(unittest.TestCase):
+    def build_graph(self):
+        graph = DiGraph()
+        for number in range(5):
+            graph.add_node(number, (float(number), number + 1.0, 0.0))
+        graph.add_node(5)
+        for number in range(4):
+            graph.add_edge(number, number + 1, number + 1)
+        graph.add_edge(4, 0, 2.5)
+        graph.add_edge(0, 5, 7)
+        return graph
+
+    def test_freeze_sizes(self):
+        graph = self.build_graph()
+        frozen = graph.freeze()
+        self.assertEqual(graph.v_size(), frozen.v_size())
+        self.assertEqual(graph.e_size(), frozen.e_size())
+        self.assertEqual(graph.get_mc(), frozen.get_mc())
+        self.assertEqual(len(frozen.keys) + 1, len(frozen.offsets))
+
+    def test_edges(self):
+        graph = self.build_graph()
+        frozen = graph.freeze()
+        for node_id in graph.get_all_v():
+            self.assertEqual(graph.all_out_edges_of_node(node_id), frozen.all_out_edges_of_node(node_id))
+            self.assertEqual(graph.all_in_edges_of_node(node_id), frozen.all_in_edges_of_node(node_id))
+        self.assertTrue(frozen.has_edge(4, 0))
+        self.assertFalse(frozen.has_edge(0, 4))
+        self.assertFalse(frozen.has_edge(0, 40))
+
+    def test_positions(self):
+        frozen = self.build_graph().freeze()
+        self.assertEqual((2, 3, 0), frozen.get_pos(2))
+        self.assertIsNone(frozen.get_pos(5))
+        refrozen = CompactGraph.from_graph(frozen)
+        self.assertEqual((2, 3, 0), refrozen.get_pos(2))
+        self.assertIsNone(refrozen.get_pos(5))
+
+    def test_immutable(self):
+        graph = self.build_graph()
+        frozen = graph.freeze()
+        self.assertFalse(frozen.add_node(10))
+        self.assertFalse(frozen.add_edge(1, 0, 1))
+        self.assertFalse(frozen.remove_edge(0, 1))
+        self.assertFalse(frozen.remove_node(0))
+        graph.remove_node(0)
+        self.assertEqual(6, frozen.v_size())
+        self.assertEqual(6, frozen.e_size())
+
+    def test_as_dict(self):
+        graph = self.build_graph()
+        self.assertEqual(graph.as_dict(), graph.freeze().as_dict())
+
+    def test_transpose(self):
+        graph = self.build_graph()
+        frozen = graph.freeze()
+        transposed = frozen.transpose()
+        self.assertIs(frozen.keys, transposed.keys)
+        self.assertIs(frozen.index_of, transposed.index_of)
+        self.assertEqual(frozen.e_size(), transposed.e_size())
+        for node_id in graph.get_all_v():
+            self.assertEqual(graph.all_in_edges_of_node(node_id), transposed.all_out_edges_of_node(node_id))
+            self.assertEqual(graph.all_out_edges_of_node(node_id), transposed.all_in_edges_of_node(node_id))
+            self.assertEqual(graph.get_pos(node_id), transposed.get_pos(node_id))
+        self.assertIs(frozen.offsets, transposed.transpose().offsets)
@@ -0,0 +1,100 @@
+import unittest
+import random
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+from ComponentsIndex import ComponentsIndex, MAX_ORDER_DEPTH
+
+
+class TestComponentsIndex(unittest.TestCase):
+    def assert_index_valid(self, algo):
+        graph = algo.get_graph()
+        index = algo.current_components()
+        self.assertIsNotNone(index)
+        expected = {frozenset(specific) for specific in ComponentsIndex(graph).components.values()}
+        self.assertEqual(expected, {frozenset(specific) for specific in index.components.values()})
+        for node_id in graph.get_all_v():
+            self.assertIn(node_id, index.components[index.component_of[node_id]])
+            for neighbor_id in graph.all_out_edges_of_node(node_id):
+                source, destination = index.component_of[node_id], index.component_of[neighbor_id]
+                if source != destination:
+                    self.assertLess(index.order[source], index.order[destination])
+
+    def test_tarjan_order(self):
+        graph = DiGraph()
+        for number in range(4):
+            graph.add_node(number)
+        graph.add_edge(0, 1, 1)
+        graph.add_edge(1, 0, 1)
+        graph.add_edge(1, 2, 1)
+        graph.add_edge(2, 3, 1)
+        tarjan_of = ComponentsIndex.tarjan(graph.get_all_v(), graph.all_out_edges_of_node)
+        self.assertEqual(tarjan_of[0], tarjan_of[1])
+        self.assertGreater(tarjan_of[1], tarjan_of[2])
+        self.assertGreater(tarjan_of[2], tarjan_of[3])
+        members = ComponentsIndex.tarjan([0, 1, 2], graph.all_out_edges_of_node, {0, 2})
+        self.assertNotEqual(members[0], members[1])
+
+    def test_incremental_edges(self):
+        rand = random.Random(17)
+        graph = DiGraph()
+        for number in range(30):
+            graph.add_node(number)
+        algo = GraphAlgo(graph)
+        algo.connected_components()
+        for step in range(400):
+            source, destination = rand.randrange(30), rand.randrange(30)
+            if rand.random() < 0.65:
+                algo.add_edge(source, destination, 1)
+            elif graph.has_edge(source, destination):
+                algo.remove_edge(source, destination)
+            self.assert_index_valid(algo)
+
+    def test_repeated_splits(self):
+        graph = DiGraph()
+        graph.add_nodes_from(range(5))
+        graph.add_edges_from([(0, 1, 1), (1, 0, 1), (1, 2, 1), (2, 3, 1), (3, 2, 1), (4, 0, 1)])
+        algo = GraphAlgo(graph)
+        algo.components_index()
+        for number in range(200):
+            algo.remove_edge(1, 0)
+            algo.add_edge(1, 0, 1)
+            algo.remove_edge(3, 2)
+            algo.add_edge(3, 2, 1)
+        index = algo.current_components()
+        self.assertLessEqual(max(len(order) for order in index.order.values()), MAX_ORDER_DEPTH)
+        self.assert_index_valid(algo)
+        algo.remove_edge(1, 0)
+        self.assertFalse(algo.same_component(0, 1))
+        self.assert_index_valid(algo)
+
+    def test_incremental_nodes(self):
+        rand = random.Random(19)
+        graph = DiGraph()
+        algo = GraphAlgo(graph)
+        algo.connected_components()
+        for step in range(300):
+            choice = rand.random()
+            if choice < 0.2:
+                algo.add_node(rand.randrange(40))
+            elif choice < 0.3:
+                algo.remove_node(rand.randrange(40))
+            elif choice < 0.35:
+                algo.remove_nodes(rand.sample(range(40), 5))
+            else:
+                algo.add_edge(rand.randrange(40), rand.randrange(40), 1)
+            self.assert_index_valid(algo)
+
+    def test_direct_edit_invalidates(self):
+        graph = DiGraph()
+        for number in range(3):
+            graph.add_node(number)
+        graph.add_edge(0, 1, 1)
+        algo = GraphAlgo(graph)
+        self.assertFalse(algo.same_component(0, 1))
+        self.assertTrue(algo.add_edge(1, 0, 1))
+        self.assertTrue(algo.same_component(0, 1))
+        graph.remove_edge(1, 0)
+        self.assertIsNone(algo.current_components())
+        self.assertFalse(algo.same_component(0, 1))
+        self.assertFalse(algo.add_edge(0, 1, 1))
+        self.assertFalse(algo.remove_node(7))
@@ -1,5 +1,7 @@
 import unittest
+import pickle
 from DiGraph import DiGraph
+from GraphInterface import GraphInterface
 
 
 class TestDiGraph(unittest.TestCase):
@@ -130,4 +132,120 @@ class TestDiGraph(unittest.TestCase):
         ans.pop(1)
         self.assertEqual(ans,graph.all_in_edges_of_node(0))
         ans.clear()
-        self.assertEqual(ans,graph.all_in_edges_of_node(1))
\ No newline at end of file
+        self.assertEqual(ans,graph.all_in_edges_of_node(1))
+    def test_bulk_add(self):
+        graph = DiGraph()
+        self.assertEqual(5, graph.add_nodes_from(range(5), [(n, n, 0) for n in range(5)]))
+        self.assertEqual(1, graph.get_mc())
+        self.assertEqual(1, graph.add_nodes_from([4, 5]))
+        self.assertEqual(2, graph.get_mc())
+        self.assertEqual(0, graph.add_nodes_from([1, 2]))
+        self.assertEqual(2, graph.get_mc())
+        self.assertEqual((3, 3, 0), graph.get_pos(3))
+        self.assertIsNone(graph.get_pos(5))
+        added = graph.add_edges_from([(0, 1, 1), (1, 2, 2), (0, 1, 5), (0, 9, 1), (2, 0, 3)])
+        self.assertEqual(3, added)
+        self.assertEqual(3, graph.get_mc())
+        self.assertEqual(3, graph.e_size())
+        self.assertEqual({1: 1}, graph.all_out_edges_of_node(0))
+        self.assertEqual({0: 1}, graph.all_in_edges_of_node(1))
+        self.assertEqual(2, graph.add_edges_from([3, 4, 3], [4, 5, 4], [1.5, 2.5, 3.5]))
+        self.assertEqual({4: 1.5}, graph.all_out_edges_of_node(3))
+        self.assertEqual(5, graph.e_size())
+        self.assertEqual(0, graph.add_edges_from([]))
+        self.assertEqual(4, graph.get_mc())
+
+    def test_from_edges(self):
+        graph = DiGraph.from_edges([(3, 1, 2), (1, 2, 1), (2, 3, 4)])
+        expected = DiGraph()
+        for number in [3, 1, 2]:
+            expected.add_node(number)
+        expected.add_edge(3, 1, 2)
+        expected.add_edge(1, 2, 1)
+        expected.add_edge(2, 3, 4)
+        self.assertEqual(expected, graph)
+        self.assertEqual(list(expected.get_all_v()), list(graph.get_all_v()))
+        self.assertEqual(expected, DiGraph.from_edges([3, 1, 2], [1, 2, 3], [2, 1, 4]))
+        self.assertEqual(0, DiGraph.from_edges([]).v_size())
+
+    def test_from_numpy_edges(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("numpy is not installed")
+        sources = numpy.array([0, 1, 2])
+        graph = DiGraph.from_edges(sources, numpy.array([1, 2, 0]), numpy.array([0.5, 1.5, 2.5]))
+        self.assertEqual(3, graph.e_size())
+        self.assertIs(type(graph.all_out_edges_of_node(1)[2]), float)
+        table = numpy.array([[0, 1, 1], [1, 0, 2]])
+        self.assertEqual(2, DiGraph.from_edges(table).e_size())
+        table = numpy.array([[0, 1, 2.5], [1, 2, 1.0]])
+        graph = DiGraph.from_edges(table)
+        self.assertEqual([0, 1, 2], list(graph.get_all_v()))
+        self.assertIs(type(next(iter(graph.get_all_v()))), int)
+        self.assertEqual({1: 2.5}, graph.all_out_edges_of_node(0))
+        self.assertEqual(2, graph.freeze().e_size())
+        graph = DiGraph()
+        graph.add_nodes_from(range(3))
+        self.assertEqual(2, graph.add_edges_from(table))
+        self.assertIs(type(next(iter(graph.all_out_edges_of_node(0)))), int)
+        self.assertEqual({2: 1.0}, graph.all_out_edges_of_node(1))
+
+    def test_remove_nodes(self):
+        graph = DiGraph()
+        graph.add_nodes_from(range(10))
+        for number in range(10):
+            graph.add_edges_from([(number, (number + 1) % 10, 1), (number, (number + 5) % 10, 1)])
+        graph.add_edge(3, 3, 1)
+        self.assertEqual(21, graph.e_size())
+        mc = graph.get_mc()
+        self.assertEqual(3, graph.remove_nodes([3, 4, 8, 30]))
+        self.assertEqual(mc + 1, graph.get_mc())
+        self.assertEqual(7, graph.v_size())
+        expected = DiGraph()
+        expected.add_nodes_from([0, 1, 2, 5, 6, 7, 9])
+        for number in range(10):
+            for dest in [(number + 1) % 10, (number + 5) % 10]:
+                expected.add_edge(number, dest, 1)
+        self.assertEqual(expected, graph)
+        self.assertEqual(expected.e_size(), graph.e_size())
+        self.assertEqual(0, graph.remove_nodes([3]))
+        self.assertEqual(mc + 1, graph.get_mc())
+
+    def test_remove_edges_from(self):
+        graph = DiGraph.from_edges([(0, 1, 1), (1, 2, 1), (2, 0, 1)])
+        mc = graph.get_mc()
+        self.assertEqual(2, graph.remove_edges_from([(0, 1), (2, 0), (0, 1), (1, 0), (5, 6)]))
+        self.assertEqual(mc + 1, graph.get_mc())
+        self.assertEqual(1, graph.e_size())
+        self.assertEqual({}, graph.all_in_edges_of_node(1))
+        self.assertFalse(graph.remove_edge(0, 1))
+        self.assertTrue(graph.remove_edge(1, 2))
+
+    def test_edgeless_nodes(self):
+        graph = DiGraph()
+        graph.add_nodes_from(range(3))
+        node = graph.get_all_v().get(0)
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertIs(node.out_edges, graph.get_all_v().get(1).out_edges)
+        self.assertEqual({}, graph.all_out_edges_of_node(0))
+        graph.add_edge(0, 1, 2)
+        self.assertEqual({1: 2}, graph.all_out_edges_of_node(0))
+        self.assertEqual({}, graph.all_out_edges_of_node(2))
+        self.assertEqual({}, graph.all_in_edges_of_node(0))
+        for edges in [graph.all_out_edges_of_node(2), graph.all_in_edges_of_node(0), graph.all_out_edges_of_node(0)]:
+            self.assertIs(dict, type(edges))
+        graph.all_out_edges_of_node(2).clear()
+        copy = pickle.loads(pickle.dumps(graph))
+        self.assertEqual(graph, copy)
+        copy.add_edge(2, 0, 1)
+        self.assertEqual({2: 1}, copy.all_in_edges_of_node(0))
+        self.assertEqual({}, graph.all_in_edges_of_node(0))
+
+    def test_get_pos(self):
+        graph = DiGraph()
+        graph.add_node(0, (1.0, 2.0, 0.0))
+        graph.add_node(1)
+        self.assertEqual((1.0, 2.0, 0.0), graph.get_pos(0))
+        self.assertIsNone(graph.get_pos(1))
+        self.assertRaises(NotImplementedError, GraphInterface().get_pos, 0)
@@ -1,6 +1,23 @@
 import unittest
+import random
+import os
+import json
+import gzip
+import asyncio
+import threading
+import weakref
+import gc
+import tempfile
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from DiGraph import DiGraph as Graph
+import GraphAlgo
 from GraphAlgo import GraphAlgo as Algo
+from ScipyBackend import ScipyBackend
+from ReversedGraph import ReversedGraph
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
 
 
 class TestGraphAlgorithms(unittest.TestCase):
@@ -92,3 +109,522 @@ class TestGraphAlgorithms(unittest.TestCase):
         algo.plot_graph()
         x = 5
         self.assertEqual(graph, graph2)
+        graph.add_node(3)
+        graph.add_edge(3, 0, 1)
+        Algo(graph.freeze()).plot_graph()
+        Algo(graph).plot_graph()
+        self.assertIsNone(graph.get_pos(3))
+
+    def test_frozen_graph(self):
+        graph = Graph()
+        for number in range(10):
+            graph.add_node(number)
+        for number in range(10):
+            graph.add_edge(number, (number + 1) % 5, number + 1)
+            graph.add_edge(number, (number + 3) % 10, 2)
+        algo = Algo(graph)
+        frozen_algo = Algo(graph.freeze())
+        for source in range(10):
+            for destination in range(10):
+                self.assertEqual(algo.shortest_path(source, destination),
+                                 frozen_algo.shortest_path(source, destination))
+        self.assertEqual(algo.connected_components(), frozen_algo.connected_components())
+        self.assertEqual(algo.connected_component(7), frozen_algo.connected_component(7))
+        rand = random.Random(29)
+        graph = Graph()
+        graph.add_nodes_from(range(300))
+        for number in range(700):
+            graph.add_edge(rand.randrange(300), rand.randrange(300), rand.randint(1, 9))
+        algo = Algo(graph)
+        frozen = graph.freeze()
+        frozen_algo = Algo(frozen)
+        for number in range(40):
+            source, destination = rand.randrange(300), rand.randrange(300)
+            distance = algo.shortest_path(source, destination)[0]
+            self.assertEqual(distance, frozen_algo.shortest_path(source, destination)[0])
+            tree = frozen_algo.shortest_path_tree(source)
+            self.assertEqual(algo.shortest_path_tree(source).distances, tree.distances)
+            self.assertEqual(distance, tree.path(destination)[0])
+        self.assertEqual([(component[0], sorted(component)) for component in algo.connected_components()],
+                         [(component[0], sorted(component)) for component in frozen_algo.connected_components()])
+        self.assertEqual(algo.tarjan_components(), frozen_algo.tarjan_components())
+
+    def test_shortest_path_early_exit(self):
+        rand = random.Random(3)
+        graph = Graph()
+        for number in range(60):
+            graph.add_node(number)
+        for number in range(300):
+            graph.add_edge(rand.randrange(60), rand.randrange(60), rand.uniform(1, 10))
+        algo = Algo(graph)
+        for source in range(0, 60, 7):
+            distances, predecessors = algo.dijkstra_algorithm(source)
+            for destination in range(60):
+                expected = distances.get(destination, float('inf'))
+                self.assertAlmostEqual(expected, algo.shortest_path(source, destination)[0])
+
+    def test_concurrent_shortest_path(self):
+        rand = random.Random(5)
+        graph = Graph()
+        for number in range(80):
+            graph.add_node(number)
+        for number in range(400):
+            graph.add_edge(rand.randrange(80), rand.randrange(80), rand.uniform(1, 10))
+        algo = Algo(graph)
+        mc = graph.get_mc()
+        pairs = [(rand.randrange(80), rand.randrange(80)) for number in range(300)]
+        expected = [algo.shortest_path(source, destination) for source, destination in pairs]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda pair: algo.shortest_path(*pair), pairs))
+        self.assertEqual(expected, results)
+        self.assertEqual(mc, graph.get_mc())
+
+    def test_bidirectional_shortest_path(self):
+        rand = random.Random(7)
+        graph = Graph()
+        for number in range(70):
+            graph.add_node(number)
+        for number in range(250):
+            graph.add_edge(rand.randrange(70), rand.randrange(70), rand.randint(1, 5))
+        algo = Algo(graph)
+        for source in range(70):
+            for destination in range(0, 70, 3):
+                expected = algo.shortest_path(source, destination)
+                distance, path = algo.shortest_path(source, destination, "bidirectional")
+                self.assertEqual(expected[0], distance)
+                if path:
+                    self.assertEqual([source, destination], [path[0], path[-1]])
+                    weights = [graph.all_out_edges_of_node(path[i]).get(path[i + 1]) for i in range(len(path) - 1)]
+                    self.assertEqual(distance, sum(weights))
+                else:
+                    self.assertEqual([], expected[1])
+        self.assertRaises(ValueError, algo.shortest_path, 0, 1, "bfs")
+
+    def test_a_star_shortest_path(self):
+        algo = Algo()
+        self.assertTrue(algo.load_from_json(os.path.join(DATA_DIR, "A1")))
+        self.assertGreater(algo.admissible_scale(), 0)
+        for source in range(0, algo.get_graph().v_size(), 4):
+            for destination in range(0, algo.get_graph().v_size(), 5):
+                expected = algo.shortest_path(source, destination)
+                distance, path = algo.shortest_path(source, destination, "astar")
+                self.assertAlmostEqual(expected[0], distance)
+                self.assertEqual([source, destination], [path[0], path[-1]])
+        graph = Graph()
+        for number in range(4):
+            graph.add_node(number)
+        graph.add_edge(0, 1, 2)
+        graph.add_edge(1, 2, 2)
+        graph.add_edge(0, 2, 5)
+        algo = Algo(graph)
+        self.assertEqual(0, algo.admissible_scale())
+        self.assertEqual((4, [0, 1, 2]), algo.shortest_path(0, 2, "astar"))
+        self.assertEqual(float('inf'), algo.shortest_path(0, 3, "astar")[0])
+        graph = Graph()
+        graph.add_node(0, (0, 0, 0))
+        graph.add_node(1, (0.5, 0, 0))
+        graph.add_node(2)
+        graph.add_node(9, (10, 0, 0))
+        graph.add_edge(0, 1, 1)
+        graph.add_edge(1, 2, 1)
+        graph.add_edge(2, 9, 1)
+        graph.add_edge(0, 9, 10)
+        algo = Algo(graph, heuristic_scale=1.0)
+        self.assertEqual((3, [0, 1, 2, 9]), algo.shortest_path(0, 9, "astar"))
+
+    def test_connected_components_random(self):
+        rand = random.Random(11)
+        for size, edges in [(40, 30), (40, 70), (60, 200)]:
+            graph = Graph()
+            for number in range(size):
+                graph.add_node(number)
+            for number in range(edges):
+                graph.add_edge(rand.randrange(size), rand.randrange(size), 1)
+            algo = Algo(graph)
+            components = algo.connected_components()
+            self.assertEqual(size, sum(len(component) for component in components))
+            for component in components:
+                found = algo.bfs_twice(component[0], {}, [])
+                self.assertEqual(component[0], found[0])
+                self.assertEqual(sorted(component), sorted(found))
+
+    def test_connected_components_long_chain(self):
+        graph = Graph()
+        for number in range(20000):
+            graph.add_node(number)
+        for number in range(19999):
+            graph.add_edge(number, number + 1, 1)
+        algo = Algo(graph)
+        components = algo.connected_components()
+        self.assertEqual(20000, len(components))
+        graph.add_edge(19999, 0, 1)
+        self.assertEqual([list(range(20000))], [sorted(component) for component in algo.connected_components()])
+
+    def test_components_cache(self):
+        graph = Graph()
+        for number in range(6):
+            graph.add_node(number)
+        for number in range(3):
+            graph.add_edge(number, (number + 1) % 3, 1)
+        graph.add_edge(3, 4, 1)
+        algo = Algo(graph)
+        self.assertTrue(algo.same_component(0, 2))
+        self.assertFalse(algo.same_component(3, 4))
+        self.assertFalse(algo.same_component(0, 10))
+        self.assertEqual([1, 0, 2], algo.connected_component(1))
+        index = algo.components_index()
+        self.assertIs(index[0], algo.components_index()[0])
+        algo.connected_component(0).append(7)
+        self.assertEqual([0, 2, 1], algo.connected_component(0))
+        graph.add_edge(4, 3, 1)
+        self.assertTrue(algo.same_component(3, 4))
+        self.assertEqual([4, 3], algo.connected_component(4))
+        self.assertEqual(4, algo.connected_component(4)[0])
+        self.assertEqual([[0, 2, 1], [3, 4], [5]], algo.connected_components())
+
+    def test_shortest_path_tree(self):
+        rand = random.Random(13)
+        graph = Graph()
+        for number in range(50):
+            graph.add_node(number)
+        for number in range(200):
+            graph.add_edge(rand.randrange(50), rand.randrange(50), rand.randint(1, 9))
+        algo = Algo(graph, tree_cache_size=2)
+        tree = algo.shortest_path_tree(3)
+        self.assertIs(tree, algo.shortest_path_tree(3))
+        for destination in range(50):
+            expected = algo.dijkstra_algorithm(3)[0].get(destination, float('inf'))
+            self.assertEqual(expected, tree.distance(destination))
+            self.assertEqual(expected, tree.path(destination)[0])
+            self.assertEqual(tree.path(destination), algo.shortest_path(3, destination))
+        algo.shortest_path_tree(4)
+        algo.shortest_path_tree(5)
+        self.assertIsNone(algo.cached_tree(3))
+        self.assertIsNotNone(algo.cached_tree(5))
+        graph.add_node(60)
+        self.assertIsNone(algo.cached_tree(5))
+        self.assertIsNot(tree, algo.shortest_path_tree(3))
+        self.assertEqual((float('inf'), []), algo.shortest_path_tree(3).path(60))
+        self.assertEqual([(3, graph.get_mc())], list(algo.tree_cache))
+        self.assertEqual((float('inf'), []), algo.shortest_path_tree(100).path(100))
+
+    def test_load_drops_caches(self):
+        algo = Algo()
+        self.assertTrue(algo.load_from_json(os.path.join(DATA_DIR, "A1")))
+        old_graph = weakref.ref(algo.get_graph())
+        algo.shortest_path_tree(0)
+        algo.connected_components()
+        algo.reachable_from(0)
+        algo.admissible_scale()
+        self.assertTrue(algo.load_from_json(os.path.join(DATA_DIR, "A2")))
+        gc.collect()
+        self.assertIsNone(old_graph())
+        self.assertEqual(0, len(algo.tree_cache))
+        self.assertEqual(algo.get_graph().v_size(), len(algo.reachable_from(0)))
+        self.assertEqual(sorted(algo.get_graph().get_all_v()), sorted(sum(algo.connected_components(), [])))
+
+    def test_save_load_binary(self):
+        algo = Algo()
+        self.assertTrue(algo.load_from_json(os.path.join(DATA_DIR, "A2")))
+        graph = algo.get_graph()
+        self.assertTrue(algo.save_to_binary("saved_graph.bin"))
+        self.assertFalse(algo.save_to_binary(""))
+        self.assertFalse(algo.load_from_binary("python"))
+        self.assertFalse(algo.load_from_binary(os.path.join(DATA_DIR, "A2")))
+        for use_mmap in [False, True]:
+            self.assertTrue(algo.load_from_binary("saved_graph.bin", use_mmap))
+            loaded = algo.get_graph()
+            self.assertEqual(graph.as_dict(), loaded.as_dict())
+            self.assertEqual(graph.get_mc(), loaded.get_mc())
+            self.assertEqual(Algo(graph).shortest_path(0, 20), algo.shortest_path(0, 20))
+        self.assertTrue(algo.save_to_binary("saved_graph.bin"))
+        self.assertTrue(algo.load_from_binary("saved_graph.bin"))
+        self.assertEqual(graph.as_dict(), algo.get_graph().as_dict())
+        os.remove("saved_graph.bin")
+
+    def test_save_json_formats(self):
+        algo = Algo()
+        self.assertTrue(algo.load_from_json(os.path.join(DATA_DIR, "A1")))
+        graph = algo.get_graph()
+        graph.add_node(100)
+        graph.add_edge(100, 0, 3)
+        graph.add_edge(0, 100, float('inf'))
+        self.assertTrue(algo.save_to_json("saved_graph"))
+        with open("saved_graph") as file:
+            self.assertEqual(json.dumps(graph.as_dict(), indent=4), file.read())
+        self.assertTrue(algo.save_to_json("saved_graph", compact=True))
+        with open("saved_graph") as file:
+            self.assertEqual(json.dumps(graph.as_dict(), separators=(",", ":")), file.read())
+        self.assertTrue(algo.save_to_json("saved_graph.gz"))
+        with gzip.open("saved_graph.gz", "rt") as file:
+            self.assertEqual(graph.as_dict(), json.load(file))
+        for name in ["saved_graph", "saved_graph.gz"]:
+            self.assertTrue(algo.load_from_json(name))
+            self.assertEqual(graph, algo.get_graph())
+        algo = Algo(Graph())
+        self.assertTrue(algo.save_to_json("saved_graph"))
+        with open("saved_graph") as file:
+            self.assertEqual(json.dumps(Graph().as_dict(), indent=4), file.read())
+        os.remove("saved_graph.gz")
+
+    def test_load_json_values(self):
+        text = '{"Edges": [{"src": "a", "w": 1, "dest": "b"}, {"src": "b", "w": null, "dest": "a"}], ' \
+               '"Nodes": [{"id": "a"}, {"id": "b"}]}'
+        with open("saved_graph", "w") as file:
+            file.write(text)
+        algo = Algo()
+        self.assertTrue(algo.load_from_json("saved_graph"))
+        self.assertEqual({"b": 1}, algo.get_graph().all_out_edges_of_node("a"))
+        self.assertIs(type(algo.get_graph().all_out_edges_of_node("a")["b"]), int)
+        self.assertEqual({"a": None}, algo.get_graph().all_out_edges_of_node("b"))
+        self.assertTrue(algo.save_to_json("saved_graph"))
+        with open("saved_graph") as file:
+            self.assertIn('"w": 1,', file.read())
+        os.remove("saved_graph")
+
+    def test_distance_matrix(self):
+        algo = Algo()
+        self.assertTrue(algo.load_from_json(os.path.join(DATA_DIR, "A1")))
+        algo.get_graph().add_node(100)
+        sources = [0, 3, 7, 100, 200]
+        targets = [5, 0, 12, 100, 200, 30]
+        matrix = algo.distance_matrix(sources, targets)
+        self.assertEqual((5, 6), matrix.shape)
+        for row, source in enumerate(sources):
+            for column, target in enumerate(targets):
+                self.assertAlmostEqual(algo.shortest_path(source, target)[0], matrix[row][column])
+        self.assertEqual(matrix.tolist(), algo.distance_matrix(sources, targets, workers=2).tolist())
+        square = algo.distance_matrix(range(5))
+        self.assertEqual((5, 5), square.shape)
+        self.assertEqual([0] * 5, square.diagonal().tolist())
+        self.assertEqual((0, 3), algo.distance_matrix([], [1, 2, 3]).shape)
+
+    def test_all_pairs_shortest_paths(self):
+        rand = random.Random(23)
+        graph = Graph()
+        graph.add_nodes_from(range(10, 50))
+        for number in range(160):
+            graph.add_edge(rand.randrange(10, 50), rand.randrange(10, 50), rand.randint(1, 9))
+        algo = Algo(graph)
+        keys, distances, next_hops = algo.all_pairs_shortest_paths()
+        self.assertEqual(list(range(10, 50)), keys)
+        for method, workers in [("dijkstra", 1), ("dijkstra", 2), ("floyd_warshall", 1)]:
+            other = algo.all_pairs_shortest_paths(method, workers)
+            self.assertEqual(distances.tolist(), other[1].tolist())
+            self.assertEqual(keys, other[0])
+            next_hops = other[2]
+            for row, source in enumerate(keys):
+                for column, target in enumerate(keys):
+                    expected = algo.shortest_path(source, target)[0]
+                    self.assertEqual(expected, distances[row][column])
+                    if expected == float('inf'):
+                        self.assertEqual(-1, next_hops[row][column])
+                        continue
+                    length, current = 0, row
+                    while current != column:
+                        hop = next_hops[current][column]
+                        length += graph.all_out_edges_of_node(keys[current])[keys[hop]]
+                        current = hop
+                    self.assertEqual(expected, length)
+        self.assertRaises(ValueError, algo.all_pairs_shortest_paths, "bfs")
+        for empty in [Graph(), Graph().freeze()]:
+            for method in ["auto", "dijkstra", "floyd_warshall"]:
+                keys, distances, next_hops = Algo(empty).all_pairs_shortest_paths(method)
+                self.assertEqual([], keys)
+                self.assertEqual((0, 0), distances.shape)
+                self.assertEqual((0, 0), next_hops.shape)
+
+    def test_without_numpy(self):
+        code = ("import sys\n"
+                "sys.modules['numpy'] = None\n"
+                "from GraphAlgo import GraphAlgo\n"
+                "algo = GraphAlgo()\n"
+                "assert algo.load_from_json(sys.argv[1])\n"
+                "print(algo.shortest_path(0, 3)[0] < float('inf'), len(algo.connected_components()))\n")
+        result = subprocess.run([sys.executable, "-c", code, os.path.join(DATA_DIR, "A1")],
+                                cwd=os.path.dirname(os.path.abspath(GraphAlgo.__file__)), capture_output=True,
+                                text=True)
+        self.assertEqual("", result.stderr)
+        self.assertEqual("True 1", result.stdout.strip())
+
+    def test_center_and_diameter(self):
+        rand = random.Random(29)
+        for size, edges in [(1, 0), (6, 4), (12, 40), (25, 100), (30, 60)]:
+            graph = Graph()
+            graph.add_nodes_from(range(size))
+            for number in range(edges):
+                graph.add_edge(rand.randrange(size), rand.randrange(size), rand.randint(1, 9))
+            algo = Algo(graph)
+            expected = {}
+            for source in range(size):
+                expected[source] = max(algo.shortest_path(source, target)[0] for target in range(size))
+            self.assertEqual(expected, algo.eccentricities())
+            for workers in [1, 2]:
+                center, eccentricity = algo.center(workers)
+                if min(expected.values()) == float('inf'):
+                    self.assertEqual((None, float('inf')), (center, eccentricity))
+                else:
+                    self.assertEqual(min(expected.values()), eccentricity)
+                    self.assertEqual(eccentricity, expected[center])
+                self.assertEqual(max(expected.values()), algo.diameter(workers))
+        algo = Algo()
+        algo.load_from_json(os.path.join(DATA_DIR, "A1"))
+        eccentricities = algo.eccentricities()
+        center, eccentricity = algo.center()
+        self.assertAlmostEqual(min(eccentricities.values()), eccentricity)
+        self.assertAlmostEqual(eccentricities[center], eccentricity)
+        self.assertAlmostEqual(max(eccentricities.values()), algo.diameter())
+        self.assertEqual((None, float('inf')), Algo(Graph()).center())
+        self.assertEqual({}, Algo(Graph()).eccentricities())
+
+    def test_shortest_paths(self):
+        algo = Algo()
+        algo.load_from_json(os.path.join(DATA_DIR, "A2"))
+        rand = random.Random(31)
+        keys = list(algo.get_graph().get_all_v())
+        pairs = [(rand.choice(keys[:5]), rand.choice(keys)) for number in range(200)]
+        pairs += [(keys[0], keys[0]), (keys[0], -1), (-1, keys[0]), pairs[0]]
+        expected = [algo.shortest_path(id1, id2) for id1, id2 in pairs]
+        for workers in [1, 2]:
+            self.assertEqual(expected, algo.shortest_paths(pairs, workers))
+        answers = algo.shortest_paths([pairs[0], pairs[0]])
+        self.assertIsNot(answers[0][1], answers[1][1])
+        self.assertEqual([], algo.shortest_paths([]))
+        self.assertEqual([(float('inf'), [])], Algo().shortest_paths([(1, 2)]))
+
+    def test_async_queries(self):
+        algo = Algo()
+        algo.load_from_json(os.path.join(DATA_DIR, "A1"))
+        release, calls = threading.Event(), []
+        shortest_path = algo.shortest_path
+
+        def blocked_shortest_path(*arguments):
+            calls.append(arguments)
+            release.wait(5)
+            return shortest_path(*arguments)
+        algo.shortest_path = blocked_shortest_path
+
+        async def queries():
+            waiting = [asyncio.ensure_future(algo.shortest_path_async(0, 20)) for number in range(4)]
+            with self.assertRaises(asyncio.TimeoutError):
+                await algo.shortest_path_async(0, 30, timeout=0.01)
+            release.set()
+            answers = await asyncio.gather(*waiting)
+            self.assertEqual(2, len(calls))
+            for answer in answers:
+                self.assertEqual(shortest_path(0, 20), answer)
+            self.assertIsNot(answers[0][1], answers[1][1])
+            self.assertEqual({}, algo.async_queries.in_flight)
+            self.assertEqual(algo.connected_components(), await algo.connected_components_async())
+            self.assertEqual(algo.connected_component(3), await algo.connected_component_async(3))
+            self.assertEqual(algo.shortest_paths([(0, 5), (5, 0)]), await algo.shortest_paths_async([(0, 5), (5, 0)]))
+        asyncio.run(queries())
+
+    @unittest.skipUnless(ScipyBackend.available(), "scipy is not installed")
+    def test_scipy_backend(self):
+        rand = random.Random(37)
+        graph = Graph()
+        graph.add_nodes_from(range(0, 120, 3))
+        for number in range(150):
+            graph.add_edge(rand.randrange(0, 120, 3), rand.randrange(0, 120, 3), rand.choice([0, 1, 2.5, 4]))
+        algo = Algo(graph, backend="parity")
+        python = Algo(graph)
+        for number in range(50):
+            id1, id2 = rand.randrange(0, 120, 3), rand.randrange(0, 120, 3)
+            self.assertEqual(python.shortest_path(id1, id2)[0], algo.shortest_path(id1, id2)[0])
+        self.assertEqual(sorted(map(sorted, python.connected_components())),
+                         sorted(map(sorted, algo.connected_components())))
+        keys, distances, next_hops = algo.all_pairs_shortest_paths()
+        self.assertEqual(python.all_pairs_shortest_paths()[1].tolist(), distances.tolist())
+        graph.add_edge(0, 3, 0.5)
+        self.assertEqual(python.shortest_path(0, 3), Algo(graph, backend="scipy").shortest_path(0, 3))
+        self.assertEqual(python.shortest_path(0, 3), algo.shortest_path(0, 3))
+        backend = ScipyBackend(graph.freeze())
+        self.assertRaises(RuntimeError, backend.check, "shortest_path", (1.0, [0, 3]), (0.5, [0, 3]))
+        self.assertRaises(RuntimeError, backend.check, "connected_components", [[0], [3]], [[0, 3]])
+        self.assertRaises(ValueError, Algo, graph, backend="gpu")
+        self.assertIn(Algo(graph, backend="auto").backend, ["python", "scipy"])
+        self.assertEqual([], Algo(Graph(), backend="scipy").connected_components())
+
+    def test_reachability(self):
+        graph = Graph()
+        graph.add_nodes_from(range(10, 17))
+        graph.add_edges_from([(10, 11, 5), (11, 12, 5), (12, 13, 5), (10, 14, 1), (14, 15, 1), (15, 16, 1),
+                              (16, 13, 1), (13, 10, 1)])
+        algo = Algo(graph)
+        self.assertEqual([10, 11, 14, 12, 15, 13, 16], algo.reachable_from(10))
+        self.assertEqual([10, 11, 14], algo.reachable_from(10, 1))
+        self.assertEqual([10], algo.reachable_from(10, 0))
+        self.assertEqual([13, 12, 16, 11, 15, 10, 14], algo.reachable_from(13, reverse=True))
+        self.assertEqual({10: 0, 11: 1, 14: 1, 12: 2, 15: 2, 13: 3, 16: 3}, algo.hop_distances(10))
+        self.assertEqual({10: 0, 11: 1, 14: 1}, algo.hop_distances(10, 1))
+        self.assertEqual((3, [10, 11, 12, 13]), algo.unweighted_shortest_path(10, 13))
+        self.assertEqual((float('inf'), []), algo.unweighted_shortest_path(10, 13, 2))
+        self.assertEqual((0, [12]), algo.unweighted_shortest_path(12, 12))
+        self.assertTrue(algo.can_reach(16, 12))
+        self.assertFalse(algo.can_reach(16, 12, 2))
+        graph.add_node(17)
+        self.assertFalse(algo.can_reach(10, 17))
+        self.assertEqual([17], algo.reachable_from(17))
+        self.assertFalse(algo.can_reach(10, 99))
+        self.assertEqual([], algo.reachable_from(99))
+        self.assertEqual({}, algo.hop_distances(99))
+        rand = random.Random(41)
+        graph = Graph()
+        graph.add_nodes_from(range(80))
+        for number in range(200):
+            graph.add_edge(rand.randrange(80), rand.randrange(80), 1)
+        algo = Algo(graph)
+        for number in range(30):
+            id1, id2 = rand.randrange(80), rand.randrange(80)
+            hops, path = algo.unweighted_shortest_path(id1, id2)
+            distance = algo.shortest_path(id1, id2)[0]
+            self.assertEqual(distance, hops)
+            self.assertEqual(hops, len(path) - 1 if path else float('inf'))
+            self.assertEqual(distance != float('inf'), algo.can_reach(id1, id2))
+            self.assertEqual(sorted(algo.dijkstra_algorithm(id1)[0]), sorted(algo.reachable_from(id1)))
+
+    def test_reversed_graph(self):
+        algo = Algo()
+        algo.load_from_json(os.path.join(DATA_DIR, "A1"))
+        graph = algo.get_graph()
+        reversed_graph = algo.reversed_graph()
+        self.assertIs(graph.get_all_v(), reversed_graph.get_all_v())
+        self.assertEqual(graph.e_size(), reversed_graph.e_size())
+        for node_id in graph.get_all_v():
+            self.assertIs(graph.all_in_edges_of_node(node_id), reversed_graph.all_out_edges_of_node(node_id))
+            self.assertIs(graph.all_out_edges_of_node(node_id), reversed_graph.all_in_edges_of_node(node_id))
+            for neighbor_id in graph.all_out_edges_of_node(node_id):
+                self.assertTrue(reversed_graph.has_edge(neighbor_id, node_id))
+        self.assertFalse(reversed_graph.add_edge(0, 1, 1.0))
+        graph.add_node(100)
+        graph.add_edge(0, 100, 2.5)
+        self.assertEqual({0: 2.5}, reversed_graph.all_out_edges_of_node(100))
+        self.assertEqual(graph.get_mc(), reversed_graph.get_mc())
+        reversed_algo = Algo(reversed_graph)
+        for node_id in [0, 5, 100]:
+            self.assertEqual(algo.shortest_path(node_id, 3)[0], reversed_algo.shortest_path(3, node_id)[0])
+        self.assertEqual(sorted(map(sorted, algo.connected_components())),
+                         sorted(map(sorted, reversed_algo.connected_components())))
+        encoded = reversed_graph.as_dict()
+        self.assertEqual(graph.e_size(), len(encoded["Edges"]))
+        self.assertIn({"src": 100, "w": 2.5, "dest": 0}, encoded["Edges"])
+        self.assertEqual(graph.as_dict()["Nodes"], encoded["Nodes"])
+        self.assertEqual(reversed_graph, Algo(graph).reversed_graph())
+        self.assertNotEqual(reversed_graph, graph)
+        self.assertEqual(ReversedGraph(reversed_graph), graph)
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertTrue(Algo(reversed_graph).save_to_json(os.path.join(directory, "reversed.json")))
+            loaded = Algo()
+            self.assertTrue(loaded.load_from_json(os.path.join(directory, "reversed.json")))
+        self.assertEqual(reversed_graph, loaded.get_graph())
+        self.assertEqual(loaded.get_graph(), reversed_graph)
+        self.assertNotEqual(graph, reversed_graph)
+        self.assertEqual(graph, graph.freeze())
+        self.assertEqual(graph.freeze(), graph)
+        self.assertNotEqual(graph, graph.freeze().transpose())
+        Algo(reversed_graph).plot_graph()
+        transposed = Algo(graph.freeze()).reversed_graph()
+        self.assertEqual(graph.all_in_edges_of_node(100), transposed.all_out_edges_of_node(100))
+        self.assertIsNone(Algo().reversed_graph())
+
@@ -0,0 +1,74 @@
+import unittest
+import os
+import tempfile
+import Instrumentation
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_disabled(self):
+        self.assertEqual([], Instrumentation.hooks)
+        with Instrumentation.recording() as records:
+            pass
+        self.assertEqual([], Instrumentation.hooks)
+        algo = GraphAlgo()
+        algo.load_from_json(os.path.join(DATA_DIR, "A1"))
+        algo.shortest_path(0, 10)
+        self.assertEqual([], records)
+
+    def test_queries(self):
+        algo = GraphAlgo()
+        algo.load_from_json(os.path.join(DATA_DIR, "A1"))
+        with Instrumentation.recording() as records:
+            for method in ["dijkstra", "bidirectional", "astar"]:
+                algo.shortest_path(0, 10, method)
+            algo.get_graph().freeze().dijkstra(0)
+        self.assertEqual(["dijkstra", "bidirectional_dijkstra", "a_star", "compact_dijkstra"],
+                         [stats.name for stats in records])
+        for stats in records:
+            counters = stats.counters
+            self.assertGreater(counters["nodes_settled"], 0)
+            self.assertGreaterEqual(counters["heap_pops"], counters["nodes_settled"])
+            self.assertGreaterEqual(counters["heap_pushes"], counters["nodes_settled"] - 2)
+            self.assertGreater(counters["edges_relaxed"], 0)
+            self.assertGreater(stats.seconds, 0)
+        self.assertEqual(17, records[-1].counters["nodes_settled"])
+        self.assertEqual(algo.get_graph().e_size(), records[-1].counters["edges_relaxed"])
+
+    def test_reachability(self):
+        algo = GraphAlgo()
+        algo.load_from_json(os.path.join(DATA_DIR, "A1"))
+        algo.reachability()
+        with Instrumentation.recording() as records:
+            reached = algo.reachable_from(0)
+            algo.bfs_twice(0, {}, [])
+        self.assertEqual(["bfs_search", "bfs_component", "bfs_twice"], [stats.name for stats in records])
+        self.assertEqual(len(reached), records[0].counters["bfs_visits"])
+        self.assertEqual(2 * 17, records[1].counters["bfs_visits"])
+        self.assertEqual(17, records[2].counters["component_size"])
+        self.assertGreaterEqual(records[2].seconds, records[1].seconds)
+
+    def test_json_phases_and_graph(self):
+        algo = GraphAlgo()
+        seen = []
+        Instrumentation.add_hook(seen.append)
+        try:
+            algo.load_from_json(os.path.join(DATA_DIR, "A1"))
+            with tempfile.TemporaryDirectory() as directory:
+                algo.save_to_json(os.path.join(directory, "graph.json"))
+            graph = DiGraph()
+            graph.add_nodes_from(range(4))
+            graph.add_edges_from([(0, 1, 1.0), (1, 2, 1.0), (2, 3, 1.0)])
+            graph.remove_nodes([1])
+        finally:
+            Instrumentation.remove_hook(seen.append)
+        stats = {record.name: record for record in seen}
+        self.assertEqual({"nodes", "edges", "parse"}, set(stats["load_from_json"].timings))
+        self.assertEqual(17, stats["load_from_json"].counters["nodes"])
+        self.assertEqual({"write", "encode"}, set(stats["save_to_json"].timings))
+        self.assertEqual(3, stats["add_edges_from"].counters["edges_added"])
+        self.assertEqual({"nodes_removed": 1, "edges_removed": 2}, dict(stats["remove_nodes"].counters))
+        self.assertEqual("remove_nodes", stats["remove_nodes"].as_dict()["name"])
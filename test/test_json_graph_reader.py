@@ -0,0 +1,38 @@
+import unittest
+import io
+import os
+import json
+from JsonGraphReader import JsonGraphReader
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+
+class TestJsonGraphReader(unittest.TestCase):
+    def read(self, text, chunk_size):
+        ans = {}
+        for key, record in JsonGraphReader(io.StringIO(text), chunk_size).records():
+            ans.setdefault(key, []).append(record)
+        return ans
+
+    def test_data_files(self):
+        for name in ["A0", "A5", "T0.json"]:
+            with open(os.path.join(DATA_DIR, name)) as file:
+                text = file.read()
+            expected = json.loads(text)
+            for chunk_size in [1, 7, 1 << 16]:
+                self.assertEqual(expected, self.read(text, chunk_size))
+
+    def test_other_keys_and_empty(self):
+        text = ' { "Name" : "g", "Count": 12345, "Nodes" : [ ], "Edges":[{"src":0,"w":1,"dest":1} ] } '
+        self.assertEqual({"Edges": [{"src": 0, "w": 1, "dest": 1}]}, self.read(text, 3))
+        self.assertEqual({}, self.read("{}", 1))
+
+    def test_numbers_across_chunks(self):
+        text = '{"version": 1.5e3, "Nodes": [{"id": 1}], "Edges": [], "Weights": [0.25, -12.5E-2, 300, 7]}'
+        for chunk_size in range(1, 12):
+            self.assertEqual({"Nodes": [{"id": 1}], "Weights": [0.25, -0.125, 300, 7]}, self.read(text, chunk_size))
+
+    def test_malformed(self):
+        self.assertRaises(ValueError, self.read, '{"Nodes": [{"id": 0}', 4)
+        self.assertRaises(ValueError, self.read, '{"Nodes": [{"id": 0}} ', 4)
+        self.assertRaises(ValueError, self.read, '[]', 4)